@@ -4,22 +4,404 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementNotInteractableException
+from selenium.common.exceptions import (
+    ElementNotInteractableException, ScriptTimeoutException, TimeoutException
+)
 from typing import Optional, List, Dict, Any
 import logging
+import sys
 import time
 
 from .domain.elements import ElementLocation, InteractiveElement, ScreenshotSection
 
+# CSS selectors for each category of interactive element
+_SELECTOR_SOURCES = {
+    # Basic form elements
+    "buttons": """
+        button,
+        input[type='button'],
+        input[type='submit'],
+        input[type='reset'],
+        [role='button'],
+        [class*='btn'],
+        [class*='button']
+    """,
+    
+    # Links and navigation
+    "links": """
+        a[href]:not([href^='#']):not([href^='javascript']),
+        [role='link']
+    """,
+    
+    # Text inputs
+    "text_inputs": """
+        input[type='text'],
+        input[type='email'],
+        input[type='password'],
+        input[type='search'],
+        input[type='tel'],
+        input[type='url'],
+        input[type='number'],
+        textarea,
+        [contenteditable='true']
+    """,
+    
+    # Selection inputs
+    "select_inputs": """
+        select,
+        [role='listbox'],
+        [role='combobox']
+    """,
+    
+    # Checkboxes and radio buttons
+    "toggles": """
+        input[type='checkbox'],
+        input[type='radio'],
+        [role='checkbox'],
+        [role='radio'],
+        [role='switch']
+    """,
+    
+    # Date and time inputs
+    "datetime_inputs": """
+        input[type='date'],
+        input[type='datetime-local'],
+        input[type='month'],
+        input[type='time'],
+        input[type='week']
+    """,
+    
+    # Special inputs
+    "special_inputs": """
+        input[type='file'],
+        input[type='color'],
+        input[type='range'],
+        [role='slider']
+    """,
+    
+    # Interactive containers
+    "containers": """
+        details,
+        dialog,
+        [role='dialog'],
+        [role='alertdialog'],
+        [class*='modal'],
+        [aria-modal='true']
+    """,
+    
+    # Navigation elements
+    "navigation": """
+        [role='navigation'],
+        [role='menu'],
+        [role='menubar'],
+        [role='menuitem'],
+        [role='tab'],
+        [role='tablist'],
+        nav
+    """,
+    
+    # Expandable content
+    "expandable": """
+        [aria-expanded],
+        [data-toggle='collapse'],
+        .accordion,
+        .collapse,
+        summary
+    """,
+    
+    # Interactive media
+    "media": """
+        video[controls],
+        audio[controls],
+        [role='slider'],
+        [role='progressbar']
+    """,
+    
+    # Tooltips and popups
+    "tooltips": """
+        [title]:not(script):not(style),
+        [data-tooltip],
+        [aria-describedby],
+        [role='tooltip']
+    """,
+    
+    # Drag and drop
+    "draggable": """
+        [draggable='true'],
+        [role='gridcell'],
+        [aria-grabbed]
+    """
+}
+
+# Clean up selectors by removing extra whitespace
+INTERACTIVE_SELECTORS = {
+    element_type: ' '.join(selector.split())
+    for element_type, selector in _SELECTOR_SOURCES.items()
+}
+
+# Union of every category, without duplicate parts, for a single DOM query
+ALL_INTERACTIVE_SELECTOR = ', '.join(dict.fromkeys(
+    part.strip()
+    for selector in INTERACTIVE_SELECTORS.values()
+    for part in selector.split(',')
+))
+
+# Attributes collected for each interactive element (value and placeholder also feed its text)
+ELEMENT_ATTRIBUTES = [
+    'class', 'id', 'href', 'role', 'aria-label',
+    'title', 'name', 'type', 'value', 'placeholder'
+]
+
+# Attributes reported by get_element_info
+ELEMENT_INFO_ATTRIBUTES = ["class", "id", "href", "aria-label", "role"]
+
+# Mirrors WebElement.get_attribute, which prefers the live property for href and value
+READ_ATTRIBUTE_FUNCTION = """
+function readAttribute(el, name) {
+    if ((name === 'href' || name === 'value') && typeof el[name] === 'string') {
+        return el[name];
+    }
+    return el.getAttribute(name);
+}
+"""
+
+# Attribute the element scan tags each element with, holding its element_id(s)
+ELEMENT_ID_ATTRIBUTE = "data-element-id"
+
+# Upper bound on the text returned per element, so huge subtrees don't bloat a scan
+ELEMENT_TEXT_LIMIT = 200
+
+# innerText forces a layout pass, so it is only read for rendered elements;
+# hidden ones fall back to the layout-free textContent
+READ_TEXT_FUNCTION = """
+function readText(el, displayed) {
+    const text = displayed ? el.innerText : el.textContent;
+    return (text || '').slice(0, %d);
+}
+""" % ELEMENT_TEXT_LIMIT
+
+# Visibility rules shared by the element scan and is_effectively_visible: hidden,
+# transparent or zero-sized elements and positioned elements outside the viewport
+IS_EFFECTIVELY_VISIBLE_FUNCTION = """
+function isEffectivelyVisible(el, style, rect) {
+    if (!el.isConnected) return false;
+    if (style.display === 'none' ||
+        style.visibility === 'hidden' ||
+        style.opacity === '0' ||
+        (style.height === '0px' && style.width === '0px')) {
+        return false;
+    }
+    if (style.position === 'fixed' || style.position === 'absolute') {
+        const x = rect.left + window.scrollX;
+        const y = rect.top + window.scrollY;
+        if (x < -rect.width || y < -rect.height ||
+            x > window.innerWidth || y > window.innerHeight) {
+            return false;
+        }
+    }
+    return true;
+}
+"""
+
+# Runs the selector query, the visibility checks and the property reads in the page,
+# so a whole scan costs one WebDriver round-trip instead of several per element.
+COLLECT_INTERACTIVE_ELEMENTS_SCRIPT = (
+    READ_ATTRIBUTE_FUNCTION + READ_TEXT_FUNCTION + IS_EFFECTIVELY_VISIBLE_FUNCTION + """
+const allSelector = arguments[0];
+const selectors = Object.entries(arguments[1]);
+const attributeNames = arguments[2];
+const scrollX = window.scrollX;
+const scrollY = window.scrollY;
+const ELEMENT_ID_ATTRIBUTE = '%s';
+const result = {elements: {}, errors: {}};
+
+function inspectElement(el) {
+    const style = window.getComputedStyle(el);
+    const rect = el.getBoundingClientRect();
+    if (!isEffectivelyVisible(el, style, rect)) return null;
+
+    const attributes = {};
+    for (const name of attributeNames) {
+        const value = readAttribute(el, name);
+        if (value) attributes[name] = value;
+    }
+    // value and placeholder are among the attributes read above; the element's text is
+    // only used when it has no value, so skip reading it otherwise
+    const value = attributes.value || '';
+    const displayed = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    return {
+        tag_name: el.tagName.toLowerCase(),
+        value: value,
+        text: value ? '' : readText(el, displayed),
+        placeholder: attributes.placeholder || '',
+        contenteditable: el.getAttribute('contenteditable'),
+        x: Math.round(rect.left + scrollX),
+        y: Math.round(rect.top + scrollY),
+        width: Math.round(rect.width),
+        height: Math.round(rect.height),
+        attributes: attributes,
+        is_enabled: !el.disabled,
+        is_displayed: displayed
+    };
+}
+
+// Walk the DOM once and bucket each match by category. An element that belongs to
+// several categories is inspected only once.
+try {
+    for (const [elementType] of selectors) {
+        result.elements[elementType] = [];
+    }
+    const matched = new Map();
+    for (const el of document.querySelectorAll(allSelector)) {
+        let item;
+        for (const [elementType, selector] of selectors) {
+            if (!el.matches(selector)) continue;
+            if (item === undefined) item = inspectElement(el);
+            if (!item) continue;
+            result.elements[elementType].push(item);
+            matched.set(item, el);
+        }
+    }
+
+    // Number the elements category by category and tag them with their ids, so
+    // find_element_by_id can locate them with a single attribute selector.
+    // An element in several categories carries one id per category.
+    for (const el of document.querySelectorAll('[' + ELEMENT_ID_ATTRIBUTE + ']')) {
+        el.removeAttribute(ELEMENT_ID_ATTRIBUTE);
+    }
+    let elementCount = 0;
+    for (const [elementType] of selectors) {
+        result.elements[elementType] = result.elements[elementType].map(item => {
+            const elementId = elementType + '_' + (++elementCount);
+            const el = matched.get(item);
+            const ids = el.getAttribute(ELEMENT_ID_ATTRIBUTE);
+            el.setAttribute(ELEMENT_ID_ATTRIBUTE, ids ? ids + ' ' + elementId : elementId);
+            return Object.assign({element_id: elementId}, item);
+        });
+    }
+} catch (e) {
+    for (const [elementType] of selectors) {
+        result.errors[elementType] = String(e);
+    }
+}
+return result;
+""" % ELEMENT_ID_ATTRIBUTE
+)
+
+# Reads the get_element_info properties of a list of elements in one round-trip
+ELEMENT_INFO_SCRIPT = READ_ATTRIBUTE_FUNCTION + READ_TEXT_FUNCTION + """
+const attributeNames = arguments[1];
+return arguments[0].map(el => {
+    const rect = el.getBoundingClientRect();
+    const attributes = {};
+    for (const name of attributeNames) {
+        const value = readAttribute(el, name);
+        if (value) attributes[name] = value;
+    }
+    const displayed = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    return {
+        tag_name: el.tagName.toLowerCase(),
+        text: readText(el, displayed),
+        is_displayed: displayed,
+        is_enabled: !el.disabled,
+        attributes: attributes,
+        location: {
+            x: Math.round(rect.left + window.scrollX),
+            y: Math.round(rect.top + window.scrollY)
+        },
+        size: {width: rect.width, height: rect.height}
+    };
+});
+"""
+
+# Checks a single element with the same rules as the element scan
+IS_EFFECTIVELY_VISIBLE_SCRIPT = IS_EFFECTIVELY_VISIBLE_FUNCTION + """
+const el = arguments[0];
+return isEffectivelyVisible(el, window.getComputedStyle(el), el.getBoundingClientRect());
+"""
+
+# Page and window dimensions in one round-trip
+PAGE_METRICS_SCRIPT = """
+return {
+    total_height: Math.max(document.documentElement.scrollHeight, document.body.scrollHeight),
+    total_width: Math.max(document.documentElement.scrollWidth, document.body.scrollWidth),
+    window_height: window.outerHeight,
+    window_width: window.outerWidth
+};
+"""
+
+# Waits in the page until the element is displayed and enabled, so the client
+# doesn't poll over the wire. Polls with timers rather than animation frames, which
+# never fire in background tabs, and resolves to false once the timeout has passed.
+WAIT_FOR_CLICKABLE_SCRIPT = """
+const el = arguments[0];
+const done = arguments[arguments.length - 1];
+const pollInterval = 50;
+let finished = false;
+let pollTimer = null;
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    clearTimeout(pollTimer);
+    clearTimeout(deadlineTimer);
+    done(result);
+}
+function check() {
+    if (!el.isConnected) return finish(false);
+    const displayed = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    if (displayed && !el.disabled) return finish(true);
+    pollTimer = setTimeout(check, pollInterval);
+}
+const deadlineTimer = setTimeout(() => finish(false), arguments[1]);
+check();
+"""
+
+# Resolves to the first element matching a CSS selector as soon as it is attached,
+# watching DOM mutations instead of polling. Resolves to null on timeout.
+WAIT_FOR_SELECTOR_SCRIPT = """
+const selector = arguments[0];
+const done = arguments[arguments.length - 1];
+const found = document.querySelector(selector);
+if (found) return done(found);
+const observer = new MutationObserver(() => {
+    const el = document.querySelector(selector);
+    if (el) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(el);
+    }
+});
+const timer = setTimeout(() => {
+    observer.disconnect();
+    done(null);
+}, arguments[1]);
+observer.observe(document, {childList: true, subtree: true});
+"""
+
 class DOMActions:
     def __init__(self, driver: WebDriver, timeout: int = 10):
         self.driver = driver
         self.timeout = timeout
-        self.actions = ActionChains(driver)
+        self._element_cache: Dict[str, WebElement] = {}
+
+    def get_viewport(self) -> Dict[str, int]:
+        """Get the page's scroll size and the outer window size in a single script call."""
+        return self.driver.execute_script(PAGE_METRICS_SCRIPT)
+
+    def clear_element_cache(self):
+        """Forget resolved element references, e.g. after navigating."""
+        self._element_cache.clear()
 
     def find_element(self, by: By, selector: str) -> Optional[WebElement]:
         """Safely find an element with wait."""
         try:
+            if by == By.CSS_SELECTOR:
+                element = self._execute_wait_script(WAIT_FOR_SELECTOR_SCRIPT, selector)
+                if element is None:
+                    raise TimeoutException()
+                logging.info(f"Element found: {by}={selector}")
+                return element
+
             element = WebDriverWait(self.driver, self.timeout).until(
                 EC.presence_of_element_located((by, selector))
             )
@@ -29,12 +411,36 @@ class DOMActions:
             logging.warning(f"Element not found: {by}={selector}")
             return None
 
+    def wait_for_page_ready(self, timeout: Optional[float] = None,
+                            ready_states: tuple = ("interactive", "complete")) -> bool:
+        """Wait until document.readyState is one of ready_states (parsed DOM by default)."""
+        try:
+            WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.readyState") in ready_states
+            )
+            return True
+        except TimeoutException:
+            logging.warning(f"Timed out waiting for document.readyState to be one of {ready_states}")
+            return False
+
+    def _execute_wait_script(self, script: str, target: Any) -> Any:
+        """Run an in-page wait script that gives up after self.timeout.
+
+        The timeout has to stay below the driver's script timeout (30s by default). If the
+        page stalls the script past that anyway, this raises TimeoutException like the
+        WebDriverWait based waits do.
+        """
+        try:
+            return self.driver.execute_async_script(script, target, int(self.timeout * 1000))
+        except ScriptTimeoutException as e:
+            raise TimeoutException(f"in-page wait did not finish: {e.msg}") from e
+
     def click(self, element: WebElement) -> bool:
         """Safely click an element."""
         try:
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.element_to_be_clickable(element)
-            ).click()
+            if not self._execute_wait_script(WAIT_FOR_CLICKABLE_SCRIPT, element):
+                raise TimeoutException("element did not become clickable")
+            element.click()
             logging.info(f"Clicked element: {element}")
             return True
         except (TimeoutException, ElementNotInteractableException) as e:
@@ -54,7 +460,7 @@ class DOMActions:
     def drag_and_drop(self, source: WebElement, target: WebElement) -> bool:
         """Perform drag and drop operation."""
         try:
-            self.actions.drag_and_drop(source, target).perform()
+            ActionChains(self.driver).drag_and_drop(source, target).perform()
             logging.info(f"Dragged {source} to {target}")
             return True
         except Exception as e:
@@ -75,7 +481,7 @@ class DOMActions:
     def hover(self, element: WebElement) -> bool:
         """Hover over an element."""
         try:
-            self.actions.move_to_element(element).perform()
+            ActionChains(self.driver).move_to_element(element).perform()
             logging.info(f"Hovered over element: {element}")
             return True
         except Exception as e:
@@ -84,225 +490,87 @@ class DOMActions:
 
     def get_element_info(self, element: WebElement) -> Dict[str, Any]:
         """Get comprehensive information about an element."""
+        return self.get_elements_info([element])[0]
+
+    def get_elements_info(self, elements: List[WebElement]) -> List[Dict[str, Any]]:
+        """Get comprehensive information about several elements in a single round-trip."""
+        if not elements:
+            return []
         try:
-            info = {
-                "tag_name": element.tag_name,
-                "text": element.text,
-                "is_displayed": element.is_displayed(),
-                "is_enabled": element.is_enabled(),
-                "attributes": {}
-            }
-            
-            # Safely get location and size
-            try:
-                info["location"] = element.location
-                info["size"] = element.size
-            except Exception as e:
-                logging.debug(f"Could not get location/size: {e}")
-                info["location"] = {"x": 0, "y": 0}
-                info["size"] = {"width": 0, "height": 0}
-
-            # Safely get attributes
-            for attr in ["class", "id", "href", "aria-label", "role"]:
-                try:
-                    value = element.get_attribute(attr)
-                    if value:
-                        info["attributes"][attr] = value
-                except Exception:
-                    continue
-
-            return info
+            return self.driver.execute_script(ELEMENT_INFO_SCRIPT, elements, ELEMENT_INFO_ATTRIBUTES)
         except Exception as e:
             logging.warning(f"Could not get element info: {e}")
-            return {
-                "error": str(e),
-                "location": {"x": 0, "y": 0},
-                "size": {"width": 0, "height": 0}
-            }
+            return [
+                {
+                    "error": str(e),
+                    "location": {"x": 0, "y": 0},
+                    "size": {"width": 0, "height": 0}
+                }
+                for _ in elements
+            ]
 
     def find_interactive_elements(self) -> Dict[str, List[InteractiveElement]]:
         """Find and return all interactive elements as InteractiveElement objects."""
-        selectors = {
-            # Basic form elements
-            "buttons": """
-                button,
-                input[type='button'],
-                input[type='submit'],
-                input[type='reset'],
-                [role='button'],
-                [class*='btn'],
-                [class*='button']
-            """,
-            
-            # Links and navigation
-            "links": """
-                a[href]:not([href^='#']):not([href^='javascript']),
-                [role='link']
-            """,
-            
-            # Text inputs
-            "text_inputs": """
-                input[type='text'],
-                input[type='email'],
-                input[type='password'],
-                input[type='search'],
-                input[type='tel'],
-                input[type='url'],
-                input[type='number'],
-                textarea,
-                [contenteditable='true']
-            """,
-            
-            # Selection inputs
-            "select_inputs": """
-                select,
-                [role='listbox'],
-                [role='combobox']
-            """,
-            
-            # Checkboxes and radio buttons
-            "toggles": """
-                input[type='checkbox'],
-                input[type='radio'],
-                [role='checkbox'],
-                [role='radio'],
-                [role='switch']
-            """,
-            
-            # Date and time inputs
-            "datetime_inputs": """
-                input[type='date'],
-                input[type='datetime-local'],
-                input[type='month'],
-                input[type='time'],
-                input[type='week']
-            """,
-            
-            # Special inputs
-            "special_inputs": """
-                input[type='file'],
-                input[type='color'],
-                input[type='range'],
-                [role='slider']
-            """,
-            
-            # Interactive containers
-            "containers": """
-                details,
-                dialog,
-                [role='dialog'],
-                [role='alertdialog'],
-                [class*='modal'],
-                [aria-modal='true']
-            """,
-            
-            # Navigation elements
-            "navigation": """
-                [role='navigation'],
-                [role='menu'],
-                [role='menubar'],
-                [role='menuitem'],
-                [role='tab'],
-                [role='tablist'],
-                nav
-            """,
-            
-            # Expandable content
-            "expandable": """
-                [aria-expanded],
-                [data-toggle='collapse'],
-                .accordion,
-                .collapse,
-                summary
-            """,
-            
-            # Interactive media
-            "media": """
-                video[controls],
-                audio[controls],
-                [role='slider'],
-                [role='progressbar']
-            """,
-            
-            # Tooltips and popups
-            "tooltips": """
-                [title]:not(script):not(style),
-                [data-tooltip],
-                [aria-describedby],
-                [role='tooltip']
-            """,
-            
-            # Drag and drop
-            "draggable": """
-                [draggable='true'],
-                [role='gridcell'],
-                [aria-grabbed]
-            """
-        }
-        
         interactive_elements = {}
-        element_count = 0  # For generating unique IDs
-        
-        for element_type, selector in selectors.items():
-            try:
-                # Clean up selector by removing extra whitespace
-                clean_selector = ' '.join(selector.split())
-                elements = self.driver.find_elements(By.CSS_SELECTOR, clean_selector)
-                
-                # Filter out hidden elements
-                visible_elements = []
-                for element in elements:
-                    if self.is_effectively_visible(element):
-                        element_count += 1
-                        
-                        # Get element text, handling special cases
-                        element_text = element.get_attribute('value') or element.text
-                        if not element_text and element.tag_name in ['input', 'textarea']:
-                            element_text = element.get_attribute('placeholder') or ''
-                        
-                        # Determine if element is an input field
-                        is_input = (
-                            element.tag_name in ['input', 'textarea', 'select'] or
-                            element.get_attribute('contenteditable') == 'true'
-                        )
-                        
-                        visible_elements.append(
-                            InteractiveElement(
-                                element_id=f"{element_type}_{element_count}",
-                                element_type=element_type,
-                                tag_name=element.tag_name,
-                                text=element_text,
-                                location=ElementLocation(
-                                    x=element.location['x'],
-                                    y=element.location['y'],
-                                    width=element.size['width'],
-                                    height=element.size['height']
-                                ),
-                                screenshot_section=ScreenshotSection(
-                                    start_section=1,  # Will be updated by element_tracker
-                                    end_section=1     # Will be updated by element_tracker
-                                ),
-                                attributes={
-                                    attr: element.get_attribute(attr) 
-                                    for attr in [
-                                        'class', 'id', 'href', 'role', 'aria-label',
-                                        'title', 'name', 'type', 'value', 'placeholder'
-                                    ] 
-                                    if element.get_attribute(attr)
-                                },
-                                is_enabled=element.is_enabled(),
-                                is_displayed=element.is_displayed(),
-                                has_input_field=is_input
-                            )
-                        )
-                
-                if visible_elements:  # Only add to dictionary if elements were found
-                    interactive_elements[element_type] = visible_elements
-                    
-            except Exception as e:
-                logging.warning(f"Error finding {element_type}: {e}")
+        # The scan renumbers elements, so previously resolved ids may now point elsewhere
+        self.clear_element_cache()
+
+        try:
+            scan = self.driver.execute_script(
+                COLLECT_INTERACTIVE_ELEMENTS_SCRIPT,
+                ALL_INTERACTIVE_SELECTOR, INTERACTIVE_SELECTORS, ELEMENT_ATTRIBUTES
+            )
+        except Exception as e:
+            logging.warning(f"Error scanning interactive elements: {e}")
+            return {element_type: [] for element_type in INTERACTIVE_SELECTORS}
+
+        for element_type in INTERACTIVE_SELECTORS:
+            if element_type in scan['errors']:
+                logging.warning(f"Error finding {element_type}: {scan['errors'][element_type]}")
                 interactive_elements[element_type] = []
-        
+                continue
+
+            visible_elements = []
+            for data in scan['elements'].get(element_type, []):
+                tag_name = sys.intern(data['tag_name'])
+
+                # Get element text, handling special cases
+                element_text = data['value'] or data['text']
+                if not element_text and tag_name in ['input', 'textarea']:
+                    element_text = data['placeholder']
+
+                # Determine if element is an input field
+                is_input = (
+                    tag_name in ['input', 'textarea', 'select'] or
+                    data['contenteditable'] == 'true'
+                )
+
+                visible_elements.append(
+                    InteractiveElement(
+                        element_id=data['element_id'],
+                        element_type=element_type,
+                        tag_name=tag_name,
+                        text=element_text,
+                        location=ElementLocation(
+                            x=data['x'],
+                            y=data['y'],
+                            width=data['width'],
+                            height=data['height']
+                        ),
+                        screenshot_section=ScreenshotSection(
+                            start_section=1,  # Will be updated by element_tracker
+                            end_section=1     # Will be updated by element_tracker
+                        ),
+                        attributes=data['attributes'],
+                        is_enabled=data['is_enabled'],
+                        is_displayed=data['is_displayed'],
+                        has_input_field=is_input
+                    )
+                )
+
+            if visible_elements:  # Only add to dictionary if elements were found
+                interactive_elements[element_type] = visible_elements
+
         return interactive_elements
 
     def is_effectively_visible(self, element: WebElement) -> bool:
@@ -312,81 +580,24 @@ class DOMActions:
         temporarily hidden but still important.
         """
         try:
-            # Check if element is connected to DOM
-            if not self.driver.execute_script("return arguments[0].isConnected", element):
-                return False
-            
-            # Get element properties
-            style = self.driver.execute_script("""
-                let style = window.getComputedStyle(arguments[0]);
-                return {
-                    display: style.display,
-                    visibility: style.visibility,
-                    opacity: style.opacity,
-                    height: style.height,
-                    width: style.width,
-                    position: style.position,
-                    clip: style.clip
-                };
-            """, element)
-            
-            # Check various conditions that might make an element effectively invisible
-            if (style['display'] == 'none' or 
-                style['visibility'] == 'hidden' or 
-                style['opacity'] == '0' or 
-                (style['height'] == '0px' and style['width'] == '0px')):
-                return False
-            
-            # Special check for elements that might be clipped or positioned off-screen
-            if style['position'] in ['fixed', 'absolute']:
-                rect = element.rect
-                viewport_height = self.driver.execute_script("return window.innerHeight")
-                viewport_width = self.driver.execute_script("return window.innerWidth")
-                
-                # Check if element is positioned outside viewport
-                if (rect['x'] < -rect['width'] or 
-                    rect['y'] < -rect['height'] or 
-                    rect['x'] > viewport_width or 
-                    rect['y'] > viewport_height):
-                    return False
-            
-            return True
-            
+            return bool(self.driver.execute_script(IS_EFFECTIVELY_VISIBLE_SCRIPT, element))
         except Exception as e:
             logging.warning(f"Error checking visibility: {e}")
             return False 
 
     def find_element_by_id(self, element_id: str) -> Optional[WebElement]:
         """Find an element by its element_id from our tracking system."""
+        element = self._element_cache.get(element_id)
+        if element is not None:
+            return element
+
         try:
-            # First try to find by our custom element_id in data-element-id attribute
-            element = self.find_element(By.CSS_SELECTOR, f'[data-element-id="{element_id}"]')
-            if element:
-                return element
-            
-            # If not found, try to find by the original element attributes
-            element_type, number = element_id.rsplit('_', 1)
-            
-            # Build a list of possible selectors based on element type
-            selectors = []
-            if element_type == "buttons":
-                selectors = ["button", "input[type='button']", "input[type='submit']", "[role='button']"]
-            elif element_type == "links":
-                selectors = ["a", "[role='link']"]
-            elif element_type == "text_inputs":
-                selectors = ["input[type='text']", "input[type='email']", "textarea"]
-            # Add more element type mappings as needed
-            
-            # Try each selector
-            elements = []
-            for selector in selectors:
-                elements.extend(self.driver.find_elements(By.CSS_SELECTOR, selector))
-            
-            # Try to match the element by index
-            index = int(number) - 1
-            if 0 <= index < len(elements):
-                return elements[index]
-            
+            elements = self.driver.find_elements(
+                By.CSS_SELECTOR, f'[{ELEMENT_ID_ATTRIBUTE}~="{element_id}"]'
+            )
+            if elements:
+                self._element_cache[element_id] = elements[0]
+                return elements[0]
             return None
             
         except Exception as e:
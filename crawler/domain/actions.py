@@ -1,7 +1,9 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Union, List
 from datetime import datetime
 from enum import Enum
+from ..utils import format_timestamp, parse_timestamp
 
 class ActionType(Enum):
     CLICK = "click"
@@ -9,31 +11,51 @@ class ActionType(Enum):
     HOVER = "hover"
     SCROLL = "scroll"
     NAVIGATE = "navigate"
+
+# Direct value lookup, cheaper than calling ActionType(value) when loading many actions
+_ACTION_TYPES_BY_VALUE = {action_type.value: action_type for action_type in ActionType}
     
-@dataclass
+@dataclass(slots=True)
 class InputAction:
     element_id: str
     input_value: str
 
-@dataclass
+@dataclass(slots=True)
 class ClickAction:
     element_id: str
 
-@dataclass
+@dataclass(slots=True)
 class HoverAction:
     element_id: str
 
-@dataclass
+@dataclass(slots=True)
 class ScrollAction:
     position: int  # Scroll position in pixels
 
-@dataclass
+@dataclass(slots=True)
 class NavigateAction:
     url: str
     
 ActionDecision = Union[InputAction, ClickAction, HoverAction, ScrollAction, NavigateAction]
 
-@dataclass
+# Action fields taken from each kind of decision, used by Action.from_decision
+_DECISION_FIELDS = {
+    InputAction: lambda d: {
+        'action_type': ActionType.INPUT,
+        'element_id': d.element_id,
+        'input_value': d.input_value
+    },
+    ClickAction: lambda d: {'action_type': ActionType.CLICK, 'element_id': d.element_id},
+    HoverAction: lambda d: {'action_type': ActionType.HOVER, 'element_id': d.element_id},
+    ScrollAction: lambda d: {
+        'action_type': ActionType.SCROLL,
+        'element_id': '',
+        'scroll_position': d.position
+    },
+    NavigateAction: lambda d: {'action_type': ActionType.NAVIGATE, 'element_id': '', 'url': d.url},
+}
+
+@dataclass(slots=True)
 class Action:
     action_id: str
     action_type: ActionType
@@ -51,7 +73,7 @@ class Action:
             'action_id': self.action_id,
             'action_type': self.action_type.value,
             'element_id': self.element_id,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': format_timestamp(self.timestamp),
             'duration': self.duration,
             'success': self.success,
             'input_value': self.input_value,
@@ -65,9 +87,9 @@ class Action:
         """Create an Action from a dictionary"""
         return cls(
             action_id=data['action_id'],
-            action_type=ActionType(data['action_type']),
+            action_type=_ACTION_TYPES_BY_VALUE[data['action_type']],
             element_id=data['element_id'],
-            timestamp=datetime.fromisoformat(data['timestamp']),
+            timestamp=parse_timestamp(data['timestamp']),
             duration=data['duration'],
             success=data['success'],
             input_value=data.get('input_value'),
@@ -77,51 +99,22 @@ class Action:
         )
     
     @classmethod
-    def from_decision(cls, action_id: str, decision: ActionDecision, duration: float, success: bool) -> 'Action':
-        """Create an Action from an ActionDecision"""
-        common_args = {
-            'action_id': action_id,
-            'timestamp': datetime.now(),
-            'duration': duration,
-            'success': success,
-            'element_id': ''  # Default empty string
-        }
-        
-        if isinstance(decision, InputAction):
-            return cls(
-                action_type=ActionType.INPUT,
-                element_id=decision.element_id,
-                input_value=decision.input_value,
-                **common_args
-            )
-        elif isinstance(decision, ClickAction):
-            return cls(
-                action_type=ActionType.CLICK,
-                element_id=decision.element_id,
-                **common_args
-            )
-        elif isinstance(decision, HoverAction):
-            return cls(
-                action_type=ActionType.HOVER,
-                element_id=decision.element_id,
-                **common_args
-            )
-        elif isinstance(decision, ScrollAction):
-            return cls(
-                action_type=ActionType.SCROLL,
-                scroll_position=decision.position,
-                **common_args
-            )
-        elif isinstance(decision, NavigateAction):
-            return cls(
-                action_type=ActionType.NAVIGATE,
-                url=decision.url,
-                **common_args
-            )
-        else:
-            raise ValueError(f"Unsupported action decision type: {type(decision)}") 
+    def from_decision(cls, action_id: str, decision: ActionDecision, duration: float, success: bool,
+                      timestamp: Optional[datetime] = None) -> 'Action':
+        """Create an Action from an ActionDecision, stamped now unless a timestamp is given"""
+        build_fields = _DECISION_FIELDS.get(type(decision))
+        if build_fields is None:
+            raise ValueError(f"Unsupported action decision type: {type(decision)}")
+
+        return cls(
+            action_id=action_id,
+            timestamp=timestamp or datetime.now(),
+            duration=duration,
+            success=success,
+            **build_fields(decision)
+        )
 
-@dataclass
+@dataclass(slots=True)
 class PageState:
     """Represents the current state of the page"""
     state_id: str
@@ -141,7 +134,7 @@ class PageState:
             'state_id': self.state_id,
             'page_id': self.page_id,
             'url': self.url,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': format_timestamp(self.timestamp),
             'screenshot_paths': self.screenshot_paths,
             'interactive_elements': self.interactive_elements,
             'current_scroll_position': self.current_scroll_position,
@@ -155,9 +148,9 @@ class PageState:
     def from_dict(cls, data: Dict) -> 'PageState':
         return cls(
             state_id=data['state_id'],
-            page_id=data['page_id'],
-            url=data['url'],
-            timestamp=datetime.fromisoformat(data['timestamp']),
+            page_id=sys.intern(data['page_id']),
+            url=sys.intern(data['url']),
+            timestamp=parse_timestamp(data['timestamp']),
             screenshot_paths=data['screenshot_paths'],
             interactive_elements=data['interactive_elements'],
             current_scroll_position=data['current_scroll_position'],
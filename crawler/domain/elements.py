@@ -1,8 +1,10 @@
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 from datetime import datetime
+from ..utils import format_timestamp, parse_timestamp
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ElementLocation:
     x: int
     y: int
@@ -17,13 +19,13 @@ class ElementLocation:
     def area(self) -> int:
         return self.width * self.height
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScreenshotSection:
     start_section: int
     end_section: int
     spans_sections: bool = False
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class InteractiveElement:
     element_id: str  # Unique identifier
     element_type: str  # button, link, input, etc.
@@ -37,8 +39,22 @@ class InteractiveElement:
     has_input_field: bool = False
     parent_form_id: Optional[str] = None
     timestamp: datetime = field(default_factory=datetime.now)
+    # Serialized form, built on the first to_dict call (the element is immutable)
+    _dict: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict:
+        """Serialize the element; callers get their own copy and may modify it."""
+        if self._dict is None:
+            object.__setattr__(self, '_dict', self._build_dict())
+        cached = self._dict
+        return {
+            **cached,
+            'location': dict(cached['location']),
+            'screenshot_section': dict(cached['screenshot_section']),
+            'attributes': dict(cached['attributes'])
+        }
+
+    def _build_dict(self) -> Dict:
         return {
             'element_id': self.element_id,
             'element_type': self.element_type,
@@ -55,12 +71,12 @@ class InteractiveElement:
                 'end_section': self.screenshot_section.end_section,
                 'spans_sections': self.screenshot_section.spans_sections
             },
-            'attributes': self.attributes,
+            'attributes': dict(self.attributes),
             'is_enabled': self.is_enabled,
             'is_displayed': self.is_displayed,
             'has_input_field': self.has_input_field,
             'parent_form_id': self.parent_form_id,
-            'timestamp': self.timestamp.isoformat()
+            'timestamp': format_timestamp(self.timestamp)
         }
     
     @classmethod
@@ -69,8 +85,8 @@ class InteractiveElement:
         screenshot_section = ScreenshotSection(**data['screenshot_section'])
         return cls(
             element_id=data['element_id'],
-            element_type=data['element_type'],
-            tag_name=data['tag_name'],
+            element_type=sys.intern(data['element_type']),
+            tag_name=sys.intern(data['tag_name']),
             text=data['text'],
             location=location,
             screenshot_section=screenshot_section,
@@ -79,5 +95,5 @@ class InteractiveElement:
             is_displayed=data['is_displayed'],
             has_input_field=data['has_input_field'],
             parent_form_id=data['parent_form_id'],
-            timestamp=datetime.fromisoformat(data['timestamp'])
+            timestamp=parse_timestamp(data['timestamp'])
         ) 
\ No newline at end of file
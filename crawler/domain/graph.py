@@ -1,8 +1,10 @@
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, KeysView, List, Optional
 from datetime import datetime
 from .page import Page
 from .actions import Action, PageState
+from ..utils import format_timestamp, parse_timestamp
 
 @dataclass
 class Edge:
@@ -21,6 +23,16 @@ class Edge:
             'transition_time': self.transition_time
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Edge':
+        return cls(
+            source_state_id=data['source_state_id'],
+            target_state_id=data['target_state_id'],
+            action=Action.from_dict(data['action']),
+            weight=data['weight'],
+            transition_time=data['transition_time']
+        )
+
 @dataclass
 class CrawlGraph:
     start_url: str
@@ -28,7 +40,19 @@ class CrawlGraph:
     states: Dict[str, PageState]  # state_id -> PageState
     edges: List[Edge]
     timestamp: datetime = field(default_factory=datetime.now)
-    visited_states: Set[str] = field(default_factory=set)
+    # Lookup indexes, kept in step with states and edges by add_state/add_edge
+    _edges_by_source: Dict[str, List[Edge]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False
+    )
+    _states_by_page: Dict[str, Dict[str, PageState]] = field(
+        default_factory=lambda: defaultdict(dict), init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for state in self.states.values():
+            self._states_by_page[state.page_id][state.state_id] = state
+        for edge in self.edges:
+            self._edges_by_source[edge.source_state_id].append(edge)
     
     def add_page(self, page: Page):
         """Add a new page to the graph"""
@@ -36,20 +60,29 @@ class CrawlGraph:
     
     def add_state(self, state: PageState):
         """Add a new state to the graph"""
+        previous = self.states.get(state.state_id)
+        if previous is not None:
+            self._states_by_page[previous.page_id].pop(state.state_id, None)
         self.states[state.state_id] = state
-        self.visited_states.add(state.state_id)
+        self._states_by_page[state.page_id][state.state_id] = state
     
     def add_edge(self, edge: Edge):
         """Add a new edge to the graph"""
         self.edges.append(edge)
+        self._edges_by_source[edge.source_state_id].append(edge)
     
+    @property
+    def visited_states(self) -> KeysView[str]:
+        """Ids of all states recorded in the graph"""
+        return self.states.keys()
+
     def get_state_transitions(self, state_id: str) -> List[Edge]:
         """Get all transitions from a given state"""
-        return [edge for edge in self.edges if edge.source_state_id == state_id]
+        return list(self._edges_by_source.get(state_id, ()))
     
     def get_page_states(self, page_id: str) -> List[PageState]:
         """Get all states for a given page"""
-        return [state for state in self.states.values() if state.page_id == page_id]
+        return list(self._states_by_page.get(page_id, {}).values())
     
     def to_dict(self) -> Dict:
         return {
@@ -57,8 +90,8 @@ class CrawlGraph:
             'pages': {pid: page.to_dict() for pid, page in self.pages.items()},
             'states': {sid: state.to_dict() for sid, state in self.states.items()},
             'edges': [edge.to_dict() for edge in self.edges],
-            'timestamp': self.timestamp.isoformat(),
-            'visited_states': list(self.visited_states)
+            'timestamp': format_timestamp(self.timestamp),
+            'visited_states': list(self.states)
         }
     
     @classmethod
@@ -73,6 +106,5 @@ class CrawlGraph:
             pages=pages,
             states=states,
             edges=edges,
-            timestamp=datetime.fromisoformat(data['timestamp']),
-            visited_states=set(data['visited_states'])
+            timestamp=parse_timestamp(data['timestamp'])
         ) 
\ No newline at end of file
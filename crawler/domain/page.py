@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime
 from .elements import InteractiveElement
+from ..utils import format_timestamp, parse_timestamp
 
 @dataclass
 class Screenshot:
@@ -37,7 +38,7 @@ class Page:
             'metadata': {
                 'url': self.metadata.url,
                 'title': self.metadata.title,
-                'timestamp': self.metadata.timestamp.isoformat(),
+                'timestamp': format_timestamp(self.metadata.timestamp),
                 'total_height': self.metadata.total_height,
                 'total_width': self.metadata.total_width,
                 'load_time': self.metadata.load_time,
@@ -59,4 +60,26 @@ class Page:
                 element.to_dict() for element in self.interactive_elements
             ],
             'html_snapshot': self.html_snapshot
-        } 
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Page':
+        metadata = data['metadata']
+        return cls(
+            page_id=data['page_id'],
+            metadata=PageMetadata(
+                url=metadata['url'],
+                title=metadata['title'],
+                timestamp=parse_timestamp(metadata['timestamp']),
+                total_height=metadata['total_height'],
+                total_width=metadata['total_width'],
+                load_time=metadata['load_time'],
+                viewport_height=metadata['viewport_height'],
+                viewport_width=metadata['viewport_width']
+            ),
+            screenshots=[Screenshot(**s) for s in data['screenshots']],
+            interactive_elements=[
+                InteractiveElement.from_dict(e) for e in data['interactive_elements']
+            ],
+            html_snapshot=data.get('html_snapshot')
+        )
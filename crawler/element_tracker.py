@@ -1,18 +1,34 @@
+from dataclasses import replace
 from typing import Dict, List, Any
-import json
 import os
 from selenium.webdriver.remote.webelement import WebElement
 import logging
 from crawler.dom_actions import InteractiveElement, ScreenshotSection
+from crawler.utils import json_dumps_bytes
+
+# Element data is appended to configs/elements.jsonl, one page per line. Setting
+# CRAWLER_PRETTY_JSON=1 writes an indented file per page instead, for debugging.
+PRETTY_JSON = os.environ.get("CRAWLER_PRETTY_JSON") == "1"
+# Write buffer for the elements log
+ELEMENTS_LOG_BUFFER_SIZE = 1 << 20
+# Number of pages appended to the elements log between flushes
+ELEMENTS_LOG_FLUSH_INTERVAL = 10
 
 class ElementTracker:
-    def __init__(self, base_dir: str):
-        """Initialize the element tracker."""
+    def __init__(self, base_dir: str, pretty: bool = PRETTY_JSON):
+        """Initialize the element tracker. pretty writes an indented config file per page."""
+        self.pretty = pretty
         self.config_dir = os.path.join(base_dir, "configs")
         os.makedirs(self.config_dir, exist_ok=True)
+        self.elements_log_path = os.path.join(self.config_dir, "elements.jsonl")
+        self._elements_log = None
+        self._unflushed_pages = 0
+        # (elements_data, section index) of the last get_elements_by_section call
+        self._section_index = None
 
     def update_screenshot_sections(self, elements: List[InteractiveElement], viewport_height: int) -> List[InteractiveElement]:
         """Update screenshot section information for each element based on its position."""
+        updated = []
         for element in elements:
             # Calculate which sections this element appears in
             element_top = element.location.y
@@ -22,14 +38,14 @@ class ElementTracker:
             start_section = max(1, int(element_top // viewport_height) + 1)
             end_section = max(1, int(element_bottom // viewport_height) + 1)
             
-            # Update the element's screenshot section
-            element.screenshot_section = ScreenshotSection(
+            # Elements are immutable, so replace each with an updated copy
+            updated.append(replace(element, screenshot_section=ScreenshotSection(
                 start_section=start_section,
                 end_section=end_section,
                 spans_sections=start_section != end_section
-            )
+            )))
         
-        return elements
+        return updated
 
     def save_page_elements(self, dom_actions, page_timestamp: str, url: str, viewport_info: Dict[str, Any]) -> Dict[str, Any]:
         """Save comprehensive data about page elements to a config file."""
@@ -55,10 +71,13 @@ class ElementTracker:
                 }
             }
 
-            # Save to config file
-            config_path = os.path.join(self.config_dir, f"{page_timestamp}_elements.json")
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(elements_data, f, indent=2)
+            if self.pretty:
+                # Readable per-page config file for debugging
+                config_path = os.path.join(self.config_dir, f"{page_timestamp}_elements.json")
+                with open(config_path, 'wb') as f:
+                    f.write(json_dumps_bytes(elements_data, indent=True))
+            else:
+                self._append_elements_log(elements_data)
 
             return elements_data
 
@@ -72,12 +91,37 @@ class ElementTracker:
                 'error': str(e)
             }
 
+    def _append_elements_log(self, elements_data: Dict[str, Any]):
+        """Appends one page's element data to the elements log."""
+        if self._elements_log is None:
+            self._elements_log = open(self.elements_log_path, 'ab', buffering=ELEMENTS_LOG_BUFFER_SIZE)
+        self._elements_log.write(json_dumps_bytes(elements_data) + b"\n")
+        self._unflushed_pages += 1
+        if self._unflushed_pages >= ELEMENTS_LOG_FLUSH_INTERVAL:
+            self._elements_log.flush()
+            self._unflushed_pages = 0
+
+    def close(self):
+        """Flushes and closes the elements log."""
+        if self._elements_log is not None:
+            self._elements_log.close()
+            self._elements_log = None
+        self._unflushed_pages = 0
+
     def _process_element_data(self, element: WebElement, dom_actions) -> Dict[str, Any]:
         """Process element data and add additional useful information."""
+        return self._process_elements_data([element], dom_actions)[0]
+
+    def _process_elements_data(self, elements: List[WebElement], dom_actions) -> List[Dict[str, Any]]:
+        """Process data for several elements, fetching their info in a single round-trip."""
+        return [
+            self._add_computed_info(element_info)
+            for element_info in dom_actions.get_elements_info(elements)
+        ]
+
+    def _add_computed_info(self, element_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Add edges, center point and area to the info returned by DOMActions."""
         try:
-            # Get base element info from DOMActions
-            element_info = dom_actions.get_element_info(element)
-            
             # Add additional computed information
             location = element_info.get('location', {})
             size = element_info.get('size', {})
@@ -114,6 +158,7 @@ class ElementTracker:
 
     def _add_section_information(self, elements_data: Dict, viewport_height: int):
         """Add information about which screenshot section contains each element."""
+        self._section_index = None
         try:
             for element_type, elements in elements_data.get('elements', {}).items():
                 for element in elements:
@@ -140,14 +185,30 @@ class ElementTracker:
         Get all elements that appear in a specific screenshot section.
         Useful for mapping elements to specific screenshots.
         """
-        section_elements = {}
-        
+        section = self.get_elements_by_section(elements_data).get(section_number, {})
+        # Every element type is listed, with an empty list when none fall in the section
+        return {
+            element_type: list(section.get(element_type, ()))
+            for element_type in elements_data['elements']
+        }
+
+    def get_elements_by_section(self, elements_data: Dict) -> Dict[int, Dict[str, List]]:
+        """
+        Group elements by every screenshot section they appear in, in a single pass.
+        The index for the most recent elements_data is reused by later calls; unlike
+        get_elements_in_section, element types without elements in a section are left out.
+        """
+        if self._section_index is not None and self._section_index[0] is elements_data:
+            return self._section_index[1]
+
+        sections: Dict[int, Dict[str, List]] = {}
         for element_type, elements in elements_data['elements'].items():
-            section_elements[element_type] = [
-                element for element in elements
-                if ('screenshot_sections' in element and
-                    element['screenshot_sections']['start_section'] <= section_number <= 
-                    element['screenshot_sections']['end_section'])
-            ]
-            
-        return section_elements 
\ No newline at end of file
+            for element in elements:
+                if 'screenshot_sections' not in element:
+                    continue
+                span = element['screenshot_sections']
+                for section_number in range(span['start_section'], span['end_section'] + 1):
+                    sections.setdefault(section_number, {}).setdefault(element_type, []).append(element)
+
+        self._section_index = (elements_data, sections)
+        return sections
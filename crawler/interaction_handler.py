@@ -1,34 +1,45 @@
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.common.by import By
-from typing import Dict, List, Callable
-import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from typing import Dict, List, Callable, Optional
 
 class InteractionHandler:
-    def __init__(self, driver: WebDriver, decision_callback: Callable):
+    def __init__(self, driver: WebDriver, decision_callback: Optional[Callable] = None):
         self.driver = driver
         self.decision_callback = decision_callback
 
     def detect_interactive_elements(self) -> Dict[str, List[WebElement]]:
         """Detect forms, buttons and other interactive elements on the page."""
-        interactive_elements = {
-            'forms': self.driver.find_elements(By.TAG_NAME, 'form'),
-            'buttons': self.driver.find_elements(By.TAG_NAME, 'button'),
-            'inputs': self.driver.find_elements(By.TAG_NAME, 'input')
-        }
+        # Nothing can be handled without a decision callback, so skip the driver calls
+        if self.decision_callback is None:
+            return {}
+
+        # One round-trip for all three groups; elements come back as WebElements
+        interactive_elements = self.driver.execute_script("""
+            return {
+                forms: Array.from(document.forms),
+                buttons: Array.from(document.getElementsByTagName('button')),
+                inputs: Array.from(document.getElementsByTagName('input'))
+            };
+        """)
         
         return {k: v for k, v in interactive_elements.items() if v}
 
     def handle_form(self, form: WebElement):
-        """Handle form interaction based on user input."""
-        inputs = form.find_elements(By.TAG_NAME, 'input')
-        for input_field in inputs:
-            input_type = input_field.get_attribute('type')
-            if input_type in ['text', 'email', 'password']:
-                placeholder = input_field.get_attribute('placeholder') or input_field.get_attribute('name')
-                value = self.decision_callback(f"Enter value for {placeholder}: ")
-                if value.lower() != 'skip':
-                    input_field.send_keys(value)
+        """Handle form interaction based on user input; 'skipall' leaves the rest of the form."""
+        # Fillable inputs and their labels in one round-trip instead of several per input
+        inputs = self.driver.execute_script("""
+            return Array.from(arguments[0].querySelectorAll('input'))
+                .filter(input => ['text', 'email', 'password'].includes(input.type))
+                .map(input => [input, input.getAttribute('placeholder') || input.getAttribute('name')]);
+        """, form)
+        for input_field, placeholder in inputs:
+            value = self.decision_callback(f"Enter value for {placeholder}: ")
+            if value.lower() == 'skipall':
+                break
+            if value.lower() != 'skip':
+                input_field.send_keys(value)
 
     def handle_clickable(self, element: WebElement):
         """Handle clickable element interaction."""
@@ -37,6 +48,10 @@ class InteractionHandler:
         if decision.lower() == 'yes':
             try:
                 element.click()
-                time.sleep(1)
+                WebDriverWait(self.driver, 10, poll_frequency=0.1).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+            except TimeoutException:
+                print("Page did not finish loading after click")
             except Exception as e:
                 print(f"Failed to click element: {str(e)}") 
\ No newline at end of file
@@ -1,7 +1,11 @@
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (
+    InvalidSessionIdException, SessionNotCreatedException, WebDriverException
+)
 from selenium.webdriver.remote.webdriver import WebDriver
+import dataclasses
 import time
 import os
+import random
 import logging
 from datetime import datetime
 from typing import List, Optional, Dict
@@ -9,15 +13,29 @@ from typing import List, Optional, Dict
 from .visualization_handler import CrawlVisualizer
 from .utils import clean_filename, timestamp_str
 from .dom_actions import DOMActions
-from selenium.webdriver.common.by import By
 from .element_tracker import ElementTracker
 from .screenshot_handler import ScreenshotHandler
 from .domain.graph import CrawlGraph, Edge
-from .domain.page import Page, PageMetadata
+from .domain.page import Page, PageMetadata, Screenshot
 from .domain.actions import Action, ActionDecision, ClickAction, HoverAction, InputAction, NavigateAction, ScrollAction, PageState
 from .repository.json_repository import JsonRepository
 from .decision_maker.base_decision_maker import BaseDecisionMaker
 
+MAX_VISIT_RETRIES = 3
+RETRY_BASE_DELAY = 0.5  # seconds, doubled on each retry
+MAX_RETRY_DELAY = 10  # seconds
+# Page loads between clearing the browser's HTTP cache and collecting garbage (Chrome only)
+BROWSER_CLEANUP_INTERVAL = 50
+
+# The parts of a PageState that are read from the live page
+PAGE_STATE_SCRIPT = """
+const formValues = {};
+for (const input of document.querySelectorAll('input[id]')) {
+    if (input.id) formValues[input.id] = input.value || '';
+}
+return {scroll_position: window.pageYOffset, form_values: formValues};
+"""
+
 class InteractiveCrawler:
     def __init__(self, driver: WebDriver, decision_maker: BaseDecisionMaker):
         """
@@ -38,74 +56,137 @@ class InteractiveCrawler:
         self.visualizer = CrawlVisualizer(self.log_file)
         self.dom_actions = DOMActions(driver)
         self.element_tracker = ElementTracker(base_dir)
-        self.screenshot_handler = ScreenshotHandler(driver, base_dir)
+        self.screenshot_handler = ScreenshotHandler(driver, base_dir, self.dom_actions)
+        # Last Page built for each URL, reused while the page is unchanged
+        self._page_cache: Dict[str, Page] = {}
+        self._pages_loaded = 0
         
         logging.basicConfig(level=logging.INFO)
 
-    def crawl(self, start_url: str) -> CrawlGraph:
+    def crawl(self, start_url: str, resume: bool = False) -> CrawlGraph:
         """
         Start crawling from the given URL using decision maker for navigation.
         
         Args:
             start_url: The URL to start crawling from
+            resume: Restore the graph from the checkpoint of an interrupted crawl
             
         Returns:
             CrawlGraph: The graph representing the crawled pages and their relationships
+
+        Raises:
+            OSError: If resuming and the checkpoint exists but cannot be read; it is left in place
         """
-        graph = CrawlGraph(start_url=start_url, pages={}, states={}, edges=[])
+        graph = None
+        if resume:
+            # Never clear the checkpoint when resuming: a partly unreadable journal is still history
+            graph = self.repository.load_checkpoint(start_url)
+        else:
+            self.repository.clear_checkpoint(start_url)
+        if graph is None:
+            graph = CrawlGraph(start_url=start_url, pages={}, states={}, edges=[])
         current_state = None
         
-        # Start with the initial URL
-        success, page = self._process_page(start_url)
-        if not success:
-            return graph
+        try:
+            # Start with the initial URL, or the last recorded state when resuming
+            restored_state = next(reversed(graph.states.values())) if graph.states else None
+            if restored_state is not None:
+                current_url = restored_state.url
+                logging.info(f"Resuming crawl with {len(graph.states)} recorded states from {current_url}")
+            else:
+                current_url = start_url
+            start_time = time.time()
+            success, page = self._process_page(current_url)
+            if not success:
+                return graph
 
-        # Add initial page to graph
-        graph.add_page(page)
-        self.repository.save_page(page)
-        current_state = self._create_page_state(page)
-        graph.add_state(current_state)  # Add initial state to graph
-
-        # Main interaction loop
-        while True:
-            # Get next action from decision maker
-            action = self.decision_maker.decide_next_action(current_state)
-            if not action:
-                break
-
-            # Execute action and get new state
-            success, new_state, action_result = self._execute_action(action)
-            if success and new_state:
-                # Add new state to graph
-                graph.add_state(new_state)
-                
-                # Create edge for the action
-                edge = Edge(
-                    source_state_id=current_state.state_id,
-                    target_state_id=new_state.state_id,
-                    action=action_result,
-                    weight=1.0,
-                    transition_time=action_result.duration
+            # Add initial page to graph
+            self._add_page(graph, page)
+            self.repository.save_page(page)
+            current_state = self._create_page_state(page)
+            self._add_state(graph, current_state)  # Add initial state to graph
+
+            # Link the restored states to everything explored after the resume
+            if restored_state is not None:
+                resume_action = Action.from_decision(
+                    action_id=f"action_{timestamp_str()}",
+                    decision=NavigateAction(url=current_url),
+                    duration=time.time() - start_time,
+                    success=True
                 )
-                graph.add_edge(edge)
+                self._add_edge(graph, Edge(
+                    source_state_id=restored_state.state_id,
+                    target_state_id=current_state.state_id,
+                    action=resume_action,
+                    weight=1.0,
+                    transition_time=resume_action.duration
+                ))
+
+            # Main interaction loop
+            while True:
+                # Get next action from decision maker
+                action = self.decision_maker.decide_next_action(current_state)
+                if not action:
+                    break
+
+                # Execute action and get new state
+                success, new_state, action_result = self._execute_action(action)
+                if success and new_state:
+                    # Add new state to graph
+                    self._add_state(graph, new_state)
+                
+                    # Create edge for the action
+                    edge = Edge(
+                        source_state_id=current_state.state_id,
+                        target_state_id=new_state.state_id,
+                        action=action_result,
+                        weight=1.0,
+                        transition_time=action_result.duration
+                    )
+                    self._add_edge(graph, edge)
                 
-                # Update current state
-                current_state = new_state
+                    # Update current state
+                    current_state = new_state
 
-            # Check if we should continue exploration
-            if not self.decision_maker.should_continue_exploration(current_state):
-                break
+                # Check if we should continue exploration
+                if not self.decision_maker.should_continue_exploration(current_state):
+                    break
 
-        # Save final graph state
-        self.repository.save_graph(graph)
-        return graph
+            # Save final graph state
+            self.repository.save_graph(graph)
+            return graph
+        finally:
+            self.repository.close_checkpoint()
+            self.element_tracker.close()
+            self.visualizer.close()
+            # Waiting for queued files raises if one failed, so it goes last
+            try:
+                self.screenshot_handler.close()
+            finally:
+                self.repository.wait_for_writes()
 
-    def _process_page(self, url: str) -> tuple[bool, Optional[Page]]:
+    def _add_page(self, graph: CrawlGraph, page: Page):
+        """Add a page to the graph and record it in the crawl checkpoint."""
+        graph.add_page(page)
+        self.repository.append_checkpoint(graph.start_url, 'page', page.to_dict())
+
+    def _add_state(self, graph: CrawlGraph, state: PageState):
+        """Add a state to the graph and record it in the crawl checkpoint."""
+        graph.add_state(state)
+        self.repository.append_checkpoint(graph.start_url, 'state', state.to_dict())
+
+    def _add_edge(self, graph: CrawlGraph, edge: Edge):
+        """Add an edge to the graph and record it in the crawl checkpoint."""
+        graph.add_edge(edge)
+        self.repository.append_checkpoint(graph.start_url, 'edge', edge.to_dict())
+
+    def _process_page(self, url: str, now: Optional[datetime] = None) -> tuple[bool, Optional[Page]]:
         """
         Process a single page during crawling.
         
         Args:
             url: The URL to process
+            now: Timestamp for the page metadata, defaults to the current time
             
         Returns:
             tuple[bool, Optional[Page]]: Success status and the processed Page object if successful
@@ -122,36 +203,59 @@ class InteractiveCrawler:
             if not screenshot_info:
                 return False, None
 
-            # Get interactive elements
-            interactive_elements = self._get_interactive_elements()
+            # Reuse the elements found during the screenshot pass instead of scanning the DOM again
+            interactive_elements = screenshot_info.get('elements')
+            if interactive_elements is None:
+                interactive_elements = self._get_interactive_elements()
+
+            # An unchanged page (e.g. after a scroll or a hover that opened nothing) keeps
+            # its Page; only the freshly tagged elements are swapped in
+            cached_page = self._page_cache.get(url)
+            if screenshot_info.get('reused') and cached_page is not None:
+                page = dataclasses.replace(cached_page, interactive_elements=interactive_elements)
+                self._page_cache[url] = page
+                return True, page
             
             # Calculate load time
             load_time = time.time() - start_time
 
             # Create page metadata
+            # The window is restored to this size after the capture, so no need to ask again
+            window_size = screenshot_info['window_size']
             metadata = PageMetadata(
                 url=url,
                 title=self.driver.title,
-                timestamp=datetime.now(),
+                timestamp=now or datetime.now(),
                 total_height=screenshot_info['dimensions']['height'],
                 total_width=screenshot_info['dimensions']['width'],
                 load_time=load_time,
-                viewport_height=self.driver.get_window_size()['height'],
-                viewport_width=self.driver.get_window_size()['width']
+                viewport_height=window_size['height'],
+                viewport_width=window_size['width']
             )
 
             # Create page object
             page = Page(
                 page_id=f"page_{clean_filename(url)}",
                 metadata=metadata,
-                screenshots=screenshot_info['screenshots'],
+                screenshots=[
+                    Screenshot(
+                        screenshot_id=s['name'],
+                        path=s['path'],
+                        section_number=i + 1,
+                        viewport_height=s['viewport_height'],
+                        viewport_width=metadata.viewport_width,
+                        scroll_position=s['scroll_position']
+                    )
+                    for i, s in enumerate(screenshot_info['screenshots'])
+                ],
                 interactive_elements=interactive_elements
             )
+            self._page_cache[url] = page
 
             # Log page visit
             self.visualizer.log_page_visit(
                 url=url,
-                title=self.driver.title,
+                title=metadata.title,
                 screenshot_name=screenshot_info['name'],
                 dimensions=screenshot_info['dimensions'],
                 processing_time=load_time
@@ -173,7 +277,9 @@ class InteractiveCrawler:
         Returns:
             tuple[bool, Optional[PageState], Optional[Action]]: Success status, new state if successful, and action result
         """
-        start_time = time.time()
+        # One clock read timestamps the action, the page and the resulting state alike
+        now = datetime.now()
+        start_time = now.timestamp()
         try:
             # Execute the action using DOM Actions
             action_success = False
@@ -198,56 +304,52 @@ class InteractiveCrawler:
                 return False, None, None
 
             # Process the new page state
-            success, page = self._process_page(self.driver.current_url)
+            success, page = self._process_page(self.driver.current_url, now=now)
             if not success:
                 return False, None, None
 
             # Create action result
             duration = time.time() - start_time
             action_result = Action.from_decision(
-                action_id=f"action_{timestamp_str()}",
+                action_id=f"action_{timestamp_str(now)}",
                 decision=action,
                 duration=duration,
-                success=True
+                success=True,
+                timestamp=now
             )
 
             # Create new state
-            new_state = self._create_page_state(page)
+            new_state = self._create_page_state(page, now=now)
             return True, new_state, action_result
 
         except Exception as e:
             logging.error(f"Failed to execute action: {e}")
             return False, None, None
 
-    def _create_page_state(self, page: Page) -> PageState:
+    def _create_page_state(self, page: Page, now: Optional[datetime] = None) -> PageState:
         """
         Create a PageState object from a Page object.
         
         Args:
             page: The Page object to convert
+            now: Timestamp for the state, defaults to the current time
             
         Returns:
             PageState: The current state of the page
         """
-        scroll_position = self.driver.execute_script("return window.pageYOffset")
-        
-        # Get form values
-        form_values = {}
-        input_elements = self.driver.find_elements(By.TAG_NAME, 'input')
-        for element in input_elements:
-            element_id = element.get_attribute('id')
-            if element_id:
-                form_values[element_id] = element.get_attribute('value') or ''
+        # Scroll position and form values in a single round-trip
+        live_state = self.driver.execute_script(PAGE_STATE_SCRIPT)
 
         # Create a unique state ID
-        state_id = f"state_{timestamp_str()}"
+        now = now or datetime.now()
+        state_id = f"state_{timestamp_str(now)}"
 
         return PageState(
             state_id=state_id,
             page_id=page.page_id,
             url=page.metadata.url,
-            timestamp=datetime.now(),
-            screenshot_paths=[s['path'] for s in page.screenshots],
+            timestamp=now,
+            screenshot_paths=[s.path for s in page.screenshots],
             interactive_elements=[
                 {
                     'element_id': e.element_id,
@@ -257,8 +359,8 @@ class InteractiveCrawler:
                 }
                 for e in page.interactive_elements
             ],
-            current_scroll_position=scroll_position,
-            form_values=form_values,
+            current_scroll_position=live_state['scroll_position'],
+            form_values=live_state['form_values'],
             page_title=page.metadata.title
         )
 
@@ -272,26 +374,32 @@ class InteractiveCrawler:
         Returns:
             bool: True if successful, False otherwise
         """
-        max_retries = 3
-        current_try = 0
-        
-        while current_try < max_retries:
+        for attempt in range(MAX_VISIT_RETRIES):
             try:
-                logging.info(f"Visiting: {url} (Attempt {current_try + 1}/{max_retries})")
+                logging.info(f"Visiting: {url} (Attempt {attempt + 1}/{MAX_VISIT_RETRIES})")
                 return self._load_page(url)
                 
-            except TimeoutException:
-                current_try += 1
-                logging.warning(f"Timeout while visiting {url}, retrying ({current_try}/{max_retries})")
-                if current_try == max_retries:
-                    self.visualizer.log_error(url, f"Timeout after {max_retries} attempts")
+            except (InvalidSessionIdException, SessionNotCreatedException) as e:
+                # The browser session itself is gone; retrying the URL cannot help
+                logging.error(f"Browser session lost while visiting {url}: {e}")
+                self.visualizer.log_error(url, f"Browser session lost: {e}")
+                return False
+
+            except WebDriverException as e:
+                # Timeouts, dropped connections and similar driver errors are usually transient
+                if attempt + 1 == MAX_VISIT_RETRIES or "chrome not reachable" in str(e):
+                    logging.error(f"Giving up on {url} after {attempt + 1} attempts: {e}")
+                    self.visualizer.log_error(url, f"Failed after {attempt + 1} attempts: {e}")
                     return False
-                time.sleep(2)
+                delay = min(MAX_RETRY_DELAY, RETRY_BASE_DELAY * 2 ** attempt) + random.random() * 0.5
+                logging.warning(f"Error while visiting {url}, retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
                 
             except Exception as e:
                 logging.error(f"Error visiting {url}: {str(e)}")
                 self.visualizer.log_error(url, str(e))
                 return False
+        return False
 
     def _load_page(self, url: str) -> bool:
         """
@@ -301,17 +409,29 @@ class InteractiveCrawler:
             url: The URL to load
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True once the page is loaded
+
+        Raises:
+            WebDriverException: If the driver fails to load the page
         """
+        if self._pages_loaded and self._pages_loaded % BROWSER_CLEANUP_INTERVAL == 0:
+            self._clean_up_browser()
+        self.driver.get(url)
+        self._pages_loaded += 1
+        self.dom_actions.clear_element_cache()
+        self.dom_actions.wait_for_page_ready()
+        logging.info(f"Page loaded: {url}")
+        return True
+
+    def _clean_up_browser(self):
+        """Clear the HTTP cache and collect garbage so a long crawl doesn't keep growing the browser."""
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return
         try:
-            self.driver.get(url)
-            self.driver.implicitly_wait(5)
-            self.driver.execute_script("return document.readyState") == "complete"
-            logging.info(f"Page loaded: {url}")
-            return True
-        except Exception as e:
-            logging.error(f"Error loading page {url}: {str(e)}")
-            return False
+            self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            self.driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        except WebDriverException as e:
+            logging.warning(f"Failed to clean up browser: {e}")
 
     def _get_interactive_elements(self) -> List:
         """Get all interactive elements from the current page."""
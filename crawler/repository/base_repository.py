@@ -14,8 +14,16 @@ class BaseRepository(ABC):
     
     @abstractmethod
     def save_page(self, page: Page) -> bool:
+        """
+        Store a page. Implementations may write in the background: True then means the
+        page was accepted, and write errors are raised by wait_for_writes.
+        """
         pass
     
     @abstractmethod
     def load_page(self, page_id: str) -> Optional[Page]:
+        pass
+
+    def wait_for_writes(self):
+        """Block until background writes are done, raising the first one that failed."""
         pass 
\ No newline at end of file
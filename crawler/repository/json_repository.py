@@ -1,13 +1,19 @@
 import json
 import logging
 import os
-from typing import Optional, Dict, List
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, List, BinaryIO
 
-from crawler.utils import clean_filename
+from crawler.utils import clean_filename, format_timestamp, json_dumps_bytes, json_loads, parse_timestamp
 from .base_repository import BaseRepository
-from ..domain.graph import CrawlGraph
+from ..domain.graph import CrawlGraph, Edge
 from ..domain.page import Page
-from ..domain.elements import InteractiveElement
+from ..domain.actions import PageState
+from ..domain.elements import ElementLocation, InteractiveElement, ScreenshotSection
+
+# Number of checkpoint records written between fsync calls
+CHECKPOINT_FSYNC_INTERVAL = 20
 
 class JsonRepository(BaseRepository):
     def __init__(self, base_dir: str):
@@ -15,35 +21,46 @@ class JsonRepository(BaseRepository):
         self.pages_dir = os.path.join(base_dir, "pages")
         self.graphs_dir = os.path.join(base_dir, "graphs")
         self.elements_dir = os.path.join(base_dir, "elements")
+        self.checkpoints_dir = os.path.join(base_dir, "checkpoints")
         
         # Create necessary directories
         os.makedirs(self.pages_dir, exist_ok=True)
         os.makedirs(self.graphs_dir, exist_ok=True)
         os.makedirs(self.elements_dir, exist_ok=True)
+        os.makedirs(self.checkpoints_dir, exist_ok=True)
         
         # In-memory cache for elements
         self._elements_cache = {}
 
+        # Open append-only checkpoint for the current crawl
+        self._checkpoint_file: Optional[BinaryIO] = None
+        self._checkpoint_path: Optional[str] = None
+        self._unsynced_records = 0
+
+        # Page and element files are serialized by the caller and written in the background
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="repository-writer")
+        self._pending_writes: List[Future] = []
+
     def save_page(self, page: Page) -> bool:
         try:
             filename = f"page_{page.page_id}.json"
             path = os.path.join(self.pages_dir, filename)
             
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(page.to_dict(), f, indent=2)
+            self._write_file_in_background(path, json_dumps_bytes(page.to_dict(), indent=True))
             return True
         except Exception as e:
             logging.error(f"Failed to save page: {e}")
             return False
 
     def load_page(self, page_id: str) -> Optional[Page]:
+        self.wait_for_writes()
         try:
             filename = f"page_{page_id}.json"
             path = os.path.join(self.pages_dir, filename)
             
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return Page.from_dict(data)
+            with open(path, 'rb') as f:
+                data = json_loads(f.read())
+            return Page.from_dict(data)
         except Exception as e:
             logging.error(f"Failed to load page: {e}")
             return None
@@ -53,25 +70,132 @@ class JsonRepository(BaseRepository):
             filename = f"graph_{clean_filename(graph.start_url)}_{graph.timestamp.strftime('%Y%m%d_%H%M%S')}.json"
             path = os.path.join(self.graphs_dir, filename)
             
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(graph.to_dict(), f, indent=2)
+            with open(path, 'wb') as f:
+                self._write_graph(f, graph)
             return True
         except Exception as e:
             logging.error(f"Failed to save graph: {e}")
             return False
 
+    def _write_graph(self, f: BinaryIO, graph: CrawlGraph):
+        """
+        Write the JSON form of graph.to_dict() one page, state and edge at a time,
+        so the whole graph is never held as a single dict. One record per line.
+        """
+        f.write(b'{"start_url": ' + json_dumps_bytes(graph.start_url))
+        for key, records in (('pages', graph.pages), ('states', graph.states)):
+            f.write(b',\n"' + key.encode('ascii') + b'": {')
+            separator = b'\n'
+            for record_id, record in records.items():
+                f.write(separator + json_dumps_bytes(record_id) + b': ' + json_dumps_bytes(record.to_dict()))
+                separator = b',\n'
+            f.write(b'\n}')
+        f.write(b',\n"edges": [')
+        separator = b'\n'
+        for edge in graph.edges:
+            f.write(separator + json_dumps_bytes(edge.to_dict()))
+            separator = b',\n'
+        f.write(b'\n],\n"timestamp": ' + json_dumps_bytes(format_timestamp(graph.timestamp)))
+        f.write(b',\n"visited_states": ' + json_dumps_bytes(list(graph.states)) + b'}\n')
+
     def load_graph(self, start_url: str) -> Optional[CrawlGraph]:
         try:
             filename = f"graph_{clean_filename(start_url)}.json"
             path = os.path.join(self.graphs_dir, filename)
             
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return CrawlGraph.from_dict(data)
+            with open(path, 'rb') as f:
+                data = json_loads(f.read())
+            return CrawlGraph.from_dict(data)
         except Exception as e:
             logging.error(f"Failed to load graph: {e}")
             return None
 
+    def append_checkpoint(self, start_url: str, record_type: str, data: Dict) -> bool:
+        """
+        Append one graph record ('page', 'state' or 'edge') to the crawl's JSONL checkpoint.
+        Records are fsynced in batches of CHECKPOINT_FSYNC_INTERVAL.
+        """
+        try:
+            path = self._get_checkpoint_path(start_url)
+            if self._checkpoint_path != path:
+                self.close_checkpoint()
+                self._checkpoint_file = open(path, 'ab')
+                self._checkpoint_path = path
+                if not self._ends_with_newline(path):
+                    # Terminate a record cut short by a crash so it stays on its own line
+                    self._checkpoint_file.write(b"\n")
+
+            self._checkpoint_file.write(json_dumps_bytes({'type': record_type, 'data': data}) + b"\n")
+            self._unsynced_records += 1
+            if self._unsynced_records >= CHECKPOINT_FSYNC_INTERVAL:
+                self._sync_checkpoint()
+            return True
+        except Exception as e:
+            logging.error(f"Failed to append checkpoint: {e}")
+            return False
+
+    def load_checkpoint(self, start_url: str) -> Optional[CrawlGraph]:
+        """
+        Rebuild a crawl graph by replaying its JSONL checkpoint.
+        Returns None if there is no checkpoint; records that cannot be replayed are
+        logged and skipped, and errors reading the file are raised, never swallowed.
+        """
+        path = self._get_checkpoint_path(start_url)
+        if not os.path.exists(path):
+            return None
+
+        graph = CrawlGraph(start_url=start_url, pages={}, states={}, edges=[])
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json_loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave the last record partially written
+                    logging.warning(f"Skipping corrupt checkpoint record at {path}:{line_number}")
+                    continue
+
+                try:
+                    if record['type'] == 'page':
+                        graph.add_page(Page.from_dict(record['data']))
+                    elif record['type'] == 'state':
+                        graph.add_state(PageState.from_dict(record['data']))
+                    elif record['type'] == 'edge':
+                        graph.add_edge(Edge.from_dict(record['data']))
+                except (KeyError, ValueError, TypeError, AttributeError) as e:
+                    logging.warning(f"Skipping invalid checkpoint record at {path}:{line_number}: {e!r}")
+        return graph
+
+    def clear_checkpoint(self, start_url: str):
+        """Remove the checkpoint of a previous crawl from the same start URL."""
+        path = self._get_checkpoint_path(start_url)
+        if self._checkpoint_path == path:
+            self.close_checkpoint()
+        if os.path.exists(path):
+            os.remove(path)
+
+    def close_checkpoint(self):
+        """Sync and close the open checkpoint file, if any."""
+        if self._checkpoint_file is not None:
+            self._sync_checkpoint()
+            self._checkpoint_file.close()
+        self._checkpoint_file = None
+        self._checkpoint_path = None
+
+    def _sync_checkpoint(self):
+        self._checkpoint_file.flush()
+        os.fsync(self._checkpoint_file.fileno())
+        self._unsynced_records = 0
+
+    def _ends_with_newline(self, path: str) -> bool:
+        with open(path, 'rb') as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _get_checkpoint_path(self, start_url: str) -> str:
+        return os.path.join(self.checkpoints_dir, f"checkpoint_{clean_filename(start_url)}.jsonl")
+
     def save_elements(self, url: str, elements_dict: Dict[str, List[InteractiveElement]]) -> bool:
         """Save interactive elements for a URL."""
         try:
@@ -88,15 +212,39 @@ class JsonRepository(BaseRepository):
             self._elements_cache[url] = elements_dict
             
             # Save to file
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(serializable_elements, f, indent=2)
+            self._write_file_in_background(path, json_dumps_bytes(serializable_elements, indent=True))
             return True
         except Exception as e:
             logging.error(f"Failed to save elements: {e}")
             return False
 
+    def _write_file_in_background(self, path: str, data: bytes):
+        """Queue data to be written to path on the repository's writer thread."""
+        self._pending_writes = [f for f in self._pending_writes if not f.done() or f.exception()]
+        self._pending_writes.append(self._write_executor.submit(_write_file_atomic, path, data))
+
+    def wait_for_writes(self):
+        """
+        Block until queued page and element files are on disk.
+        Raises the first write error once every queued write has finished.
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        error = None
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Failed to write repository file: {e}")
+                error = error or e
+        if error is not None:
+            raise error
+
     def get_elements(self, url: str) -> Optional[Dict[str, List[InteractiveElement]]]:
-        """Get interactive elements for a URL, first from cache then from file."""
+        """Get interactive elements for a URL, first from cache then from file.
+
+        Not used by the crawl itself: stored elements carry no data-element-id tags in
+        the live DOM, so the screenshot pass always rescans the page instead.
+        """
         try:
             # Check cache first
             if url in self._elements_cache:
@@ -109,16 +257,16 @@ class JsonRepository(BaseRepository):
             if not os.path.exists(path):
                 return None
             
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                elements_dict = {
-                    element_type: [self._dict_to_element(e) for e in elements]
-                    for element_type, elements in data.items()
-                }
-                
-                # Update cache
-                self._elements_cache[url] = elements_dict
-                return elements_dict
+            with open(path, 'rb') as f:
+                data = json_loads(f.read())
+            elements_dict = {
+                element_type: [self._dict_to_element(e) for e in elements]
+                for element_type, elements in data.items()
+            }
+            
+            # Update cache
+            self._elements_cache[url] = elements_dict
+            return elements_dict
         except Exception as e:
             logging.error(f"Failed to load elements: {e}")
             return None
@@ -146,34 +294,41 @@ class JsonRepository(BaseRepository):
             'is_displayed': element.is_displayed,
             'has_input_field': element.has_input_field,
             'parent_form_id': element.parent_form_id,
-            'timestamp': element.timestamp.isoformat()
+            'timestamp': format_timestamp(element.timestamp)
         }
 
     def _dict_to_element(self, data: dict) -> InteractiveElement:
         """Convert dictionary to InteractiveElement."""
-        from ..domain.elements import ElementLocation, ScreenshotSection
-        from datetime import datetime
-        
+        location = data['location']
+        section = data['screenshot_section']
         return InteractiveElement(
             element_id=data['element_id'],
-            element_type=data['element_type'],
-            tag_name=data['tag_name'],
+            element_type=sys.intern(data['element_type']),
+            tag_name=sys.intern(data['tag_name']),
             text=data['text'],
             location=ElementLocation(
-                x=data['location']['x'],
-                y=data['location']['y'],
-                width=data['location']['width'],
-                height=data['location']['height']
+                x=location['x'],
+                y=location['y'],
+                width=location['width'],
+                height=location['height']
             ),
             screenshot_section=ScreenshotSection(
-                start_section=data['screenshot_section']['start_section'],
-                end_section=data['screenshot_section']['end_section'],
-                spans_sections=data['screenshot_section']['spans_sections']
+                start_section=section['start_section'],
+                end_section=section['end_section'],
+                spans_sections=section['spans_sections']
             ),
             attributes=data['attributes'],
             is_enabled=data['is_enabled'],
             is_displayed=data['is_displayed'],
             has_input_field=data['has_input_field'],
             parent_form_id=data.get('parent_form_id'),
-            timestamp=datetime.fromisoformat(data['timestamp'])
-        ) 
\ No newline at end of file
+            timestamp=parse_timestamp(data['timestamp'])
+        ) 
+
+
+def _write_file_atomic(path: str, data: bytes):
+    """Write data to a temporary file and move it into place, so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
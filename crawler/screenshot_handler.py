@@ -1,29 +1,122 @@
 import os
-import json
-import time
+import base64
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from .utils import clean_filename, timestamp_str
+from .utils import clean_filename, json_dumps_bytes, timestamp_str
 from .dom_actions import DOMActions
 from .repository.json_repository import JsonRepository
 
+PAGE_LOG_BUFFER_SIZE = 1 << 20
+# Number of pages appended to the page log between flushes
+PAGE_LOG_FLUSH_INTERVAL = 10
+
+# Scrolls to arguments[0] and calls back once the DOM has seen no mutations for
+# 100 ms after the next frame (capped at 2 s), instead of sleeping a fixed delay.
+SCROLL_AND_SETTLE_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const quietPeriod = 100;
+const maxWait = 2000;
+let quietTimer = null;
+let finished = false;
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietPeriod);
+});
+function finish() {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    done();
+}
+observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+window.scrollTo(0, arguments[0]);
+requestAnimationFrame(() => {
+    quietTimer = setTimeout(finish, quietPeriod);
+});
+setTimeout(finish, maxWait);
+"""
+
+# Keeps scrolling to the bottom until the page height stops growing, entirely in the
+# page. Bounded so that infinite-scroll pages finish inside the default script timeout.
+SCROLL_TO_BOTTOM_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const pollInterval = 300;
+const maxDuration = 20000;
+const started = Date.now();
+let lastHeight = document.body.scrollHeight;
+function step() {
+    window.scrollTo(0, document.body.scrollHeight);
+    setTimeout(() => {
+        const newHeight = document.body.scrollHeight;
+        if (newHeight === lastHeight || Date.now() - started > maxDuration) {
+            window.scrollTo(0, 0);
+            done();
+            return;
+        }
+        lastHeight = newHeight;
+        step();
+    }, pollInterval);
+}
+step();
+"""
+
+# Cheap fingerprint of what a capture would show: element count, text length, open
+# menus and disclosures, scroll size, viewport and live form state. Only native DOM properties are read, so it stays
+# fast on large documents, and the document itself never crosses the wire.
+DOM_SIGNATURE_SCRIPT = """
+const root = document.documentElement;
+const formState = Array.from(
+    document.querySelectorAll('input, textarea, select'),
+    field => field.value + (field.checked ? '\\u0001' : '')
+).join('\\u0000');
+return [
+    document.getElementsByTagName('*').length,
+    root.textContent.length,
+    document.querySelectorAll('[aria-expanded="true"], [open]').length,
+    root.scrollHeight,
+    root.scrollWidth,
+    window.innerWidth,
+    window.innerHeight,
+    formState
+];
+"""
+
 
 class ScreenshotHandler:
-    def __init__(self, driver: WebDriver, base_dir: str):
+    def __init__(self, driver: WebDriver, base_dir: str, dom_actions: Optional[DOMActions] = None):
         self.driver = driver
         self.screenshot_dir = os.path.join(base_dir, "screenshots")
         os.makedirs(self.screenshot_dir, exist_ok=True)
-        self.dom_actions = DOMActions(driver)
+        self.dom_actions = dom_actions or DOMActions(driver)
         self.repository = JsonRepository(base_dir)
+        # Chromium drivers can capture regions beyond the viewport via CDP
+        self.supports_cdp = hasattr(driver, "execute_cdp_cmd")
+        # PNG files are written in the background while the next section is captured
+        self._write_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot-writer")
+        # Page records are appended to one JSONL log instead of a JSON file per page
+        self.page_log_path = os.path.join(self.screenshot_dir, "page_info.jsonl")
+        self._page_log = None
+        self._unflushed_pages = 0
+        # (url, DOM signature, result) of the last capture, reused while the page is unchanged
+        self._last_capture = None
         
     def take_full_page_screenshot(self, url: str) -> dict:
         """
         Takes sectional screenshots of a page by scrolling through it.
         Returns a dictionary containing screenshot metadata and paths.
         """
+        original_size = None
         try:
+            # Skip the capture when the page looks exactly like the last one we captured
+            signature = self.driver.execute_script(DOM_SIGNATURE_SCRIPT)
+            if self._last_capture is not None and self._last_capture[:2] == (url, signature):
+                return self._reuse_last_capture()
+
             # Create timestamp and directories
             timestamp = timestamp_str()
             page_dir_name = f"{timestamp}_{clean_filename(url)[:50]}"
@@ -34,17 +127,15 @@ class ScreenshotHandler:
             # This also helps with finding all interactive elements
             self._scroll_through_page()
             
-            # Get page dimensions
-            total_height = self.driver.execute_script(
-                "return Math.max(document.documentElement.scrollHeight, "
-                "document.body.scrollHeight);"
-            )
-            total_width = self.driver.execute_script(
-                "return Math.max(document.documentElement.scrollWidth, "
-                "document.body.scrollWidth);"
-            )
+            # Get page dimensions (after scrolling, which may have loaded more content)
+            page_metrics = self.dom_actions.get_viewport()
+            total_height = page_metrics['total_height']
+            total_width = page_metrics['total_width']
             
-            original_size = self.driver.get_window_size()
+            # The outer window size matches get_window_size(); some headless modes report 0
+            original_size = {'width': page_metrics['window_width'], 'height': page_metrics['window_height']}
+            if not original_size['width'] or not original_size['height']:
+                original_size = self.driver.get_window_size()
             viewport_info = {
                 'viewport_height': original_size['height'],
                 'viewport_width': original_size['width'],
@@ -55,52 +146,59 @@ class ScreenshotHandler:
             # Calculate number of screenshots needed
             num_sections = (total_height + original_size['height'] - 1) // original_size['height']
             screenshots = []
+            sections_info = []
+            pending_writes = []
 
-            # Set window size to capture full width
-            self.driver.set_window_size(total_width, original_size['height'])
+            # Set window size to capture full width (CDP captures clip regions directly)
+            if not self.supports_cdp:
+                self.driver.set_window_size(total_width, original_size['height'])
 
-            # Get all interactive elements (first check repository)
-            all_elements_dict = self.repository.get_elements(url)
-            if not all_elements_dict:
-                # If not in repository, find them and save
-                all_elements_dict = self.dom_actions.find_interactive_elements()
-                self.repository.save_elements(url, all_elements_dict)
+            # Scan the live page, which also tags the elements for find_element_by_id
+            all_elements_dict = self.dom_actions.find_interactive_elements()
+            self.repository.save_elements(url, all_elements_dict)
             
-            all_elements = self._convert_interactive_elements(all_elements_dict)
+            all_elements = self._convert_interactive_elements(all_elements_dict, original_size['height'])
+            element_extents = self._element_extents(all_elements)
 
             # Take screenshots of each section and collect elements
             for i in range(num_sections):
                 screenshot_info = self._take_section_screenshot(
-                    i, screenshots_dir, original_size['height']
+                    i, screenshots_dir, original_size['height'], total_width, total_height,
+                    pending_writes
                 )
                 screenshots.append(screenshot_info)
                 
                 # Filter elements for current viewport
                 viewport_elements = self._filter_viewport_elements(
                     all_elements, 
+                    element_extents,
                     screenshot_info['scroll_position'], 
                     original_size['height']
                 )
                 
-                # Save viewport information and elements for this section
-                self._save_section_info(
-                    screenshots_dir, i, original_size, screenshot_info['scroll_position'],
+                # Collect viewport information and elements for this section
+                sections_info.append(self._create_section_info(
+                    i, original_size, screenshot_info['scroll_position'],
                     viewport_elements
-                )
+                ))
 
             # Save overall page information
             page_info = self._create_page_info(
                 url, timestamp, total_height, total_width, 
                 original_size, num_sections, screenshots,
-                all_elements
+                all_elements, sections_info
             )
             
-            self._save_page_info(screenshots_dir, page_info)
+            # Make sure every section PNG is on disk before recording the page
+            for future in pending_writes:
+                future.result()
+            self._save_page_info(page_info)
 
-            # Restore window size
-            self._restore_window_size(original_size)
+            # Restore window size (the CDP path never changes it)
+            if not self.supports_cdp:
+                self._restore_window_size(original_size)
 
-            return {
+            capture = {
                 'name': page_dir_name,
                 'path': screenshots_dir,
                 'dimensions': {
@@ -108,86 +206,113 @@ class ScreenshotHandler:
                     'height': total_height
                 },
                 'sections': num_sections,
+                'window_size': original_size,
                 'screenshots': screenshots,
-                'interactive_elements': all_elements
+                'interactive_elements': all_elements,
+                'elements': [
+                    element
+                    for elements in all_elements_dict.values()
+                    for element in elements
+                ]
             }
+            self._last_capture = (url, signature, capture)
+            return capture
 
         except Exception as e:
             logging.error(f"Screenshot failed: {str(e)}", exc_info=True)
-            self._restore_window_size(original_size)
+            if original_size is not None and not self.supports_cdp:
+                self._restore_window_size(original_size)
             return None
 
-    def _convert_interactive_elements(self, elements_dict: dict) -> list:
+    def _reuse_last_capture(self) -> dict:
+        """Returns the last capture for an unchanged page, rescanning only its elements."""
+        url, _, capture = self._last_capture
+        logging.info(f"Page unchanged since last capture, reusing screenshots: {url}")
+        # Load lazy content as the original capture did, then rescan: the scan is cheap
+        # and re-tags the live DOM, which find_element_by_id relies on
+        self._scroll_through_page()
+        elements_dict = self.dom_actions.find_interactive_elements()
+        return {
+            **capture,
+            'reused': True,
+            'elements': [
+                element
+                for elements in elements_dict.values()
+                for element in elements
+            ]
+        }
+
+    def _convert_interactive_elements(self, elements_dict: dict, viewport_height: int) -> list:
         """Convert InteractiveElement objects to serializable dictionaries."""
         all_elements = []
         for element_type, elements in elements_dict.items():
             for element in elements:
-                try:
-                    # Calculate element's top and bottom positions
-                    element_top = element.location.y
-                    element_bottom = element_top + element.location.height
-                    
-                    # Calculate which sections this element appears in
-                    viewport_height = self.driver.get_window_size()['height']
-                    start_section = max(1, int(element_top // viewport_height) + 1)
-                    end_section = max(1, int(element_bottom // viewport_height) + 1)
-                    
-                    all_elements.append({
-                        'element_id': element.element_id,
-                        'element_type': element_type,
-                        'tag_name': element.tag_name,
-                        'text': element.text,
-                        'location': {
-                            'x': element.location.x,
-                            'y': element.location.y,
-                            'width': element.location.width,
-                            'height': element.location.height
-                        },
-                        'attributes': element.attributes,
-                        'is_enabled': element.is_enabled,
-                        'is_displayed': element.is_displayed,
-                        'has_input_field': element.has_input_field,
-                        'screenshot_section': {
-                            'start_section': start_section,
-                            'end_section': end_section,
-                            'spans_sections': start_section != end_section
-                        }
-                    })
-                except Exception as e:
-                    logging.warning(f"Failed to convert element: {e}")
+                location = element.location
+                if location is None:
                     continue
+
+                # Calculate which sections this element appears in
+                start_section = max(1, int(location.y // viewport_height) + 1)
+                end_section = max(1, int((location.y + location.height) // viewport_height) + 1)
+
+                all_elements.append({
+                    'element_id': element.element_id,
+                    'element_type': element_type,
+                    'tag_name': element.tag_name,
+                    'text': element.text,
+                    'location': {
+                        'x': location.x,
+                        'y': location.y,
+                        'width': location.width,
+                        'height': location.height
+                    },
+                    'attributes': element.attributes,
+                    'is_enabled': element.is_enabled,
+                    'is_displayed': element.is_displayed,
+                    'has_input_field': element.has_input_field,
+                    'screenshot_section': {
+                        'start_section': start_section,
+                        'end_section': end_section,
+                        'spans_sections': start_section != end_section
+                    }
+                })
         return all_elements
 
-    def _filter_viewport_elements(self, all_elements: list, scroll_top: int, viewport_height: int) -> list:
+    def _element_extents(self, all_elements: list) -> tuple[list, list]:
+        """Collect the top and bottom edge of every element into two parallel lists."""
+        tops = [element['location']['y'] for element in all_elements]
+        bottoms = [
+            top + element['location']['height']
+            for top, element in zip(tops, all_elements)
+        ]
+        return tops, bottoms
+
+    def _filter_viewport_elements(self, all_elements: list, element_extents: tuple[list, list],
+                                  scroll_top: int, viewport_height: int) -> list:
         """Filter elements that are visible in the current viewport."""
-        viewport_elements = []
-        for element in all_elements:
-            element_top = element['location']['y']
-            element_bottom = element_top + element['location']['height']
-            
-            # Check if element is visible in this viewport section
-            if (scroll_top <= element_bottom and 
-                element_top < scroll_top + viewport_height):
-                viewport_elements.append(element)
-        return viewport_elements
-
-    def _save_section_info(self, screenshots_dir: str, section_num: int, 
-                          window_size: dict, scroll_top: int, viewport_elements: list):
-        """Saves metadata for a single section."""
-        viewport_info = {
+        tops, bottoms = element_extents
+        viewport_bottom = scroll_top + viewport_height
+        return [
+            element
+            for element, element_top, element_bottom in zip(all_elements, tops, bottoms)
+            if scroll_top <= element_bottom and element_top < viewport_bottom
+        ]
+
+    def _create_section_info(self, section_num: int, window_size: dict,
+                             scroll_top: int, viewport_elements: list) -> dict:
+        """Creates the metadata for a single section (stored with the page info)."""
+        return {
             'scroll_top': scroll_top,
             'viewport_height': window_size['height'],
             'viewport_width': window_size['width'],
             'section_number': section_num + 1,
             'interactive_elements': viewport_elements
         }
-        info_path = os.path.join(screenshots_dir, f"section_{section_num + 1}_info.json")
-        with open(info_path, 'w') as f:
-            json.dump(viewport_info, f, indent=2)
 
     def _create_page_info(self, url: str, timestamp: str, total_height: int, 
                          total_width: int, window_size: dict, num_sections: int, 
-                         screenshots: list, interactive_elements: list) -> dict:
+                         screenshots: list, interactive_elements: list,
+                         sections: list) -> dict:
         """Creates the overall page information dictionary."""
         return {
             'total_height': total_height,
@@ -198,21 +323,31 @@ class ScreenshotHandler:
             'timestamp': timestamp,
             'url': url,
             'screenshots': screenshots,
+            'sections': sections,
             'interactive_elements': interactive_elements
         }
 
-    def _take_section_screenshot(self, section_num: int, screenshots_dir: str, viewport_height: int) -> dict:
+    def _take_section_screenshot(self, section_num: int, screenshots_dir: str, viewport_height: int,
+                                 total_width: int, total_height: int, pending_writes: list) -> dict:
         """Takes a screenshot of a single section of the page."""
         scroll_top = section_num * viewport_height
         
-        # Scroll to position
-        self.driver.execute_script(f"window.scrollTo(0, {scroll_top});")
-        time.sleep(0.5)  # Wait for any dynamic content
-        
         # Take screenshot
         screenshot_name = f"section_{section_num + 1}.png"
         screenshot_path = os.path.join(screenshots_dir, screenshot_name)
-        self.driver.save_screenshot(screenshot_path)
+        if self.supports_cdp:
+            png = self._capture_cdp_screenshot({
+                'x': 0,
+                'y': scroll_top,
+                'width': total_width,
+                'height': min(viewport_height, total_height - scroll_top),
+                'scale': 1
+            })
+        else:
+            # Scroll to position and wait until scroll-triggered DOM changes settle
+            self.driver.execute_async_script(SCROLL_AND_SETTLE_SCRIPT, scroll_top)
+            png = self.driver.get_screenshot_as_png()
+        pending_writes.append(self._write_executor.submit(self._write_png, screenshot_path, png))
         
         return {
             'name': screenshot_name,
@@ -221,10 +356,42 @@ class ScreenshotHandler:
             'viewport_height': viewport_height
         }
 
-    def _save_page_info(self, screenshots_dir: str, page_info: dict):
-        """Saves the overall page information to a file."""
-        with open(os.path.join(screenshots_dir, 'page_info.json'), 'w') as f:
-            json.dump(page_info, f, indent=2)
+    def _capture_cdp_screenshot(self, clip: dict) -> bytes:
+        """Captures a page region in one CDP call, without scrolling the window."""
+        result = self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+            'format': 'png',
+            'captureBeyondViewport': True,
+            'clip': clip
+        })
+        return base64.b64decode(result['data'])
+
+    def _write_png(self, path: str, png: bytes):
+        """Writes raw PNG bytes straight to a file descriptor."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(png)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    def _save_page_info(self, page_info: dict):
+        """Appends the overall page information to the page log."""
+        if self._page_log is None:
+            self._page_log = open(self.page_log_path, 'ab', buffering=PAGE_LOG_BUFFER_SIZE)
+        self._page_log.write(json_dumps_bytes(page_info) + b"\n")
+        self._unflushed_pages += 1
+        if self._unflushed_pages >= PAGE_LOG_FLUSH_INTERVAL:
+            self._page_log.flush()
+            self._unflushed_pages = 0
+
+    def close(self):
+        """Flushes and closes the page log and waits for queued element files, raising if one failed."""
+        if self._page_log is not None:
+            self._page_log.close()
+            self._page_log = None
+        self._unflushed_pages = 0
+        self.repository.wait_for_writes()
 
     def _restore_window_size(self, original_size: dict):
         """Restores the window to its original size."""
@@ -236,20 +403,6 @@ class ScreenshotHandler:
     def _scroll_through_page(self) -> None:
         """Scroll through the entire page to load all dynamic content."""
         try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            while True:
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                
-                if new_height == last_height:
-                    break
-                    
-                last_height = new_height
-                
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            
+            self.driver.execute_async_script(SCROLL_TO_BOTTOM_SCRIPT)
         except Exception as e:
-            logging.warning(f"Error during page scrolling: {e}")
\ No newline at end of file
+            logging.warning(f"Error during page scrolling: {e}")
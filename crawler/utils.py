@@ -1,14 +1,61 @@
 # crawler/utils.py
 
 import os
+import re
+import json
+import time
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+_SCHEME_RE = re.compile(r'https?://')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^A-Za-z0-9_.-]')
+
+@lru_cache(maxsize=1024)
 def clean_filename(url):
     """Convert a URL into a safe filename by removing special chars."""
-    return url.replace("http://", "").replace("https://", "").replace("/", "_")
+    return _UNSAFE_FILENAME_CHARS_RE.sub('_', _SCHEME_RE.sub('', url))
+
+def json_dumps_bytes(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON (compact, or indented by 2), using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Loaded crawl records share many timestamps, so parsed values are memoized
+@lru_cache(maxsize=65536)
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp written by format_timestamp."""
+    return datetime.fromisoformat(value)
+
+def format_timestamp(value: datetime) -> str:
+    """Format a timestamp as ISO 8601."""
+    return value.isoformat()
+
+# (second, formatted string) of the last current-time timestamp_str() call
+_last_timestamp = (None, "")
 
-def timestamp_str():
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+def timestamp_str(now: Optional[datetime] = None):
+    if now is not None:
+        return now.strftime("%Y%m%d_%H%M%S")
+    global _last_timestamp
+    second = int(time.time())
+    if second != _last_timestamp[0]:
+        _last_timestamp = (second, time.strftime("%Y%m%d_%H%M%S", time.localtime(second)))
+    return _last_timestamp[1]
 
 # crawler/utils.py (or define in main.py)
 def manual_decision_prompt(message):
@@ -1,119 +1,176 @@
 import os
+import heapq
 from datetime import datetime
-from typing import Dict, TextIO
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Optional, TextIO
+
+LOG_BUFFER_SIZE = 64 * 1024
+# Progress updates between full re-emissions of the tree and Mermaid diagram
+FULL_PROGRESS_INTERVAL = 10
+
+@lru_cache(maxsize=4096)
+def _strip_scheme(url: str) -> str:
+    """URL without its http(s):// prefix, as shown in the tree and diagram labels."""
+    return url.replace('https://', '').replace('http://', '')
 
 class CrawlVisualizer:
     def __init__(self, log_file_path: str):
         self.log_file = log_file_path
+        self._log_fh: Optional[TextIO] = None
+        self._updates_since_full = 0
+        # Latest graph whose tree and diagram have not been written yet
+        self._pending_graph: Optional[Dict] = None
+
+    def _get_log_file(self) -> TextIO:
+        """Return the shared append-mode log handle, opening it on first use."""
+        if self._log_fh is None or self._log_fh.closed:
+            self._log_fh = open(self.log_file, "a", encoding="utf-8", buffering=LOG_BUFFER_SIZE)
+        return self._log_fh
+
+    def flush(self):
+        """Flush buffered log output to disk."""
+        if self._log_fh is not None and not self._log_fh.closed:
+            self._log_fh.flush()
+
+    def close(self):
+        """Write any pending tree and diagram, then flush and close the log file handle."""
+        self.finalize()
+        if self._log_fh is not None and not self._log_fh.closed:
+            self._log_fh.close()
+        self._log_fh = None
         
     def initialize_log(self):
         """Initialize the log file with headers."""
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write("\n# Crawl Progress - Real-time Updates\n\n")
-            f.write("*This visualization updates in real-time as pages are crawled*\n\n")
+        f = self._get_log_file()
+        f.write("\n# Crawl Progress - Real-time Updates\n\n")
+        f.write("*This visualization updates in real-time as pages are crawled*\n\n")
 
     def update_progress(self, graph: Dict, referrers: Dict, latest_url: str):
-        """Update the visualization after each page visit."""
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            self._write_progress_header(f, graph, latest_url)
-            self._write_tree_structure(f, graph)
-            self._write_mermaid_diagram(f, graph)
-            self._write_multiple_paths(f, referrers)
+        """Update the visualization after each page visit.
+
+        The header and multi-path summary are written every time; the full tree and
+        diagram only every FULL_PROGRESS_INTERVAL updates and on finalize(), so the
+        log grows linearly with the crawl.
+        """
+        f = self._get_log_file()
+        self._write_progress_header(f, graph, latest_url)
+        self._updates_since_full += 1
+        if self._updates_since_full >= FULL_PROGRESS_INTERVAL:
+            self._write_full_progress(f, graph)
+        else:
+            self._pending_graph = graph
+        self._write_multiple_paths(f, referrers)
+
+    def finalize(self):
+        """Write the tree and diagram for the latest update if they were skipped."""
+        if self._pending_graph is not None:
+            self._write_full_progress(self._get_log_file(), self._pending_graph)
+
+    def _write_full_progress(self, file: TextIO, graph: Dict):
+        """Write the tree structure and Mermaid diagram of the whole graph."""
+        self._write_tree_structure(file, graph)
+        self._write_mermaid_diagram(file, graph)
+        self._updates_since_full = 0
+        self._pending_graph = None
 
     def log_page_visit(self, url: str, title: str, screenshot_name: str, 
                        dimensions: Dict[str, int], processing_time: float):
         """Log information about a visited page."""
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(f"\n## Page: {url}\n")
-            f.write(f"**Title**: {title}\n")
-            f.write(f"**Time**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**Processing Time**: {processing_time:.2f} seconds\n")
-            f.write(f"**Page Dimensions**: {dimensions['width']}x{dimensions['height']} pixels\n")
-            f.write(f"**Screenshots Directory**: `{screenshot_name}`\n\n")
+        f = self._get_log_file()
+        f.write(f"\n## Page: {url}\n")
+        f.write(f"**Title**: {title}\n")
+        f.write(f"**Time**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"**Processing Time**: {processing_time:.2f} seconds\n")
+        f.write(f"**Page Dimensions**: {dimensions['width']}x{dimensions['height']} pixels\n")
+        f.write(f"**Screenshots Directory**: `{screenshot_name}`\n\n")
+        
+        # Add section information if available
+        if 'sections' in dimensions:
+            f.write(f"**Number of Sections**: {dimensions['sections']}\n")
+            f.write("\n### Screenshots:\n")
+            for i in range(dimensions['sections']):
+                f.write(f"- [Section {i + 1}]({screenshot_name}/section_{i + 1}.png)\n")
+
+        # Add elements information
+        if 'elements_data' in dimensions:
+            f.write("\n### Interactive Elements Summary\n")
+            elements_data = dimensions['elements_data']
             
-            # Add section information if available
-            if 'sections' in dimensions:
-                f.write(f"**Number of Sections**: {dimensions['sections']}\n")
-                f.write("\n### Screenshots:\n")
-                for i in range(dimensions['sections']):
-                    f.write(f"- [Section {i + 1}]({screenshot_name}/section_{i + 1}.png)\n")
-
-            # Add elements information
-            if 'elements_data' in dimensions:
-                f.write("\n### Interactive Elements Summary\n")
-                elements_data = dimensions['elements_data']
-                
-                # Interactive elements
-                f.write("\n#### Interactive Elements\n")
-                for element_type, elements in elements_data['interactive_elements'].items():
-                    if elements:
-                        f.write(f"- {element_type.replace('_', ' ').title()}: {len(elements)}\n")
-
-                # Accessibility elements
-                f.write("\n#### Accessibility Elements\n")
-                for element_type, elements in elements_data['accessibility_elements'].items():
-                    if elements:
-                        f.write(f"- {element_type.replace('_', ' ').title()}: {len(elements)}\n")
-
-                # Forms
-                if elements_data['form_elements']:
-                    f.write(f"\n#### Forms: {len(elements_data['form_elements'])}\n")
-
-                f.write(f"\nDetailed elements configuration: `{dimensions['elements_config']}`\n")
+            # Interactive elements
+            f.write("\n#### Interactive Elements\n")
+            for element_type, elements in elements_data['interactive_elements'].items():
+                if elements:
+                    f.write(f"- {element_type.replace('_', ' ').title()}: {len(elements)}\n")
+
+            # Accessibility elements
+            f.write("\n#### Accessibility Elements\n")
+            for element_type, elements in elements_data['accessibility_elements'].items():
+                if elements:
+                    f.write(f"- {element_type.replace('_', ' ').title()}: {len(elements)}\n")
+
+            # Forms
+            if elements_data['form_elements']:
+                f.write(f"\n#### Forms: {len(elements_data['form_elements'])}\n")
+
+            f.write(f"\nDetailed elements configuration: `{dimensions['elements_config']}`\n")
 
     def log_error(self, url: str, error: str):
         """Log an error that occurred during crawling."""
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(f"\n## ❌ Failed: {url}\n")
-            f.write(f"**Error**: {error}\n\n---\n")
+        f = self._get_log_file()
+        f.write(f"\n## ❌ Failed: {url}\n")
+        f.write(f"**Error**: {error}\n\n---\n")
 
     def _write_tree_structure(self, file: TextIO, graph: Dict):
         """Write a tree-like structure of the crawled pages."""
         def _short_url(url):
-            return url.replace('https://', '').replace('http://', '')[:50]
+            return _strip_scheme(url)[:50]
+
+        # Start with the root (first URL added to the graph)
+        if not graph:
+            return
+
+        # Iterative DFS; a (url, None) entry marks leaving url's subtree so that
+        # `visited` only holds the URLs on the path from the root to the current node
+        visited = set()
+        stack = [(next(iter(graph)), 0)]
+        while stack:
+            url, indent = stack.pop()
+            if indent is None:
+                visited.discard(url)
+                continue
 
-        def _write_node(url, indent=0, visited=None):
-            if visited is None:
-                visited = set()
-            
             # Check for cyclic references
             if url in visited:
                 file.write(f"{'    ' * indent}└── {_short_url(url)} (cyclic)\n")
-                return
+                continue
             visited.add(url)
 
             file.write(f"{'    ' * indent}└── {_short_url(url)}\n")
+            stack.append((url, None))
             if url in graph:
-                for link in sorted(graph[url]['links'])[:5]:  # Limit to 5 children for readability
-                    _write_node(link, indent + 1, visited.copy())
-
-        # Start with the root (first URL added to the graph)
-        if graph:
-            root_url = next(iter(graph))
-            _write_node(root_url)
+                children = heapq.nsmallest(5, graph[url]['links'])  # Limit to 5 children for readability
+                stack.extend((link, indent + 1) for link in reversed(children))
 
     def _write_mermaid_diagram(self, file: TextIO, graph: Dict):
         """Write a Mermaid.js compatible diagram of the crawled pages."""
+        # Assign sequential, collision-free node IDs in a single pass
+        node_ids = {url: f"page_{i}" for i, url in enumerate(graph)}
+
         def _node_id(url):
-            # Create a unique, safe node ID
-            return f"page_{hash(url) % 10000}"
+            return node_ids.setdefault(url, f"page_{len(node_ids)}")
 
         def _short_label(url):
-            return url.replace('https://', '').replace('http://', '')[:20] + "..."
+            return _strip_scheme(url)[:20] + "..."
 
-        # Prevent duplicate nodes
-        written_nodes = set()
-        for url in graph:
-            node_id = _node_id(url)
-            if node_id not in written_nodes:
-                file.write(f'    {node_id}["{_short_label(url)}"]\n')
-                written_nodes.add(node_id)
+        for url, node_id in node_ids.items():
+            file.write(f'    {node_id}["{_short_label(url)}"]\n')
 
         # Prevent duplicate edges
         written_edges = set()
         for url, data in graph.items():
-            source_id = _node_id(url)
-            for link in list(data['links'])[:3]:
+            source_id = node_ids[url]
+            for link in islice(data['links'], 3):
                 target_id = _node_id(link)
                 edge = f"{source_id}-->{target_id}"
                 if edge not in written_edges:
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 
-import sys
+import argparse
 import os
+import re
+import subprocess
 import time
 import logging
 
 from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
@@ -24,18 +25,61 @@ def setup_logging():
     logging.getLogger('selenium').setLevel(logging.WARNING)
     logging.getLogger('urllib3').setLevel(logging.WARNING)
 
-def main():
-    setup_logging()
-    
-    # Parse URL from command line or default
-    if len(sys.argv) > 1:
-        start_url = sys.argv[1]
-    else:
-        start_url = "https://quickbooks.intuit.com"
+DRIVER_PATH_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "webcrawler")
+DRIVER_PATH_CACHE_TTL = 7 * 24 * 3600  # seconds
+
+def chrome_major_version() -> str:
+    """Return the installed Chrome major version, or 'unknown' if it cannot be determined."""
+    for binary in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser"):
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+)\.", output)
+        if match:
+            return match.group(1)
+    return "unknown"
+
+def resolve_chromedriver_path() -> str:
+    """
+    Return the chromedriver path, reusing the one resolved on a previous run.
 
-    # Setup Selenium for headless Chrome
+    ChromeDriverManager checks online for the latest driver on every install(),
+    so the resolved path is cached per Chrome major version and only refreshed
+    once it is older than DRIVER_PATH_CACHE_TTL or no longer executable.
+    """
+    cache_path = os.path.join(DRIVER_PATH_CACHE_DIR, f"chromedriver_path_{chrome_major_version()}")
+    try:
+        if time.time() - os.path.getmtime(cache_path) < DRIVER_PATH_CACHE_TTL:
+            with open(cache_path, encoding="utf-8") as f:
+                driver_path = f.read().strip()
+            if os.path.exists(driver_path) and os.access(driver_path, os.X_OK):
+                return driver_path
+    except OSError:
+        pass
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    driver_path = ChromeDriverManager().install()
+    try:
+        os.makedirs(DRIVER_PATH_CACHE_DIR, exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            f.write(driver_path)
+    except OSError as e:
+        logging.warning(f"Could not cache chromedriver path: {e}")
+    return driver_path
+
+def make_crawl_driver(headless: bool = False, load_images: bool = True) -> webdriver.Chrome:
+    """
+    Create the Chrome driver used for a crawl.
+
+    Pages are loaded with the 'eager' strategy so driver.get returns at
+    DOMContentLoaded. Image loading can be disabled for crawls that do not
+    need screenshots, which cuts most of the page weight. When
+    SELENIUM_REMOTE_URL is set, the session is created on that Selenium Grid.
+    """
     chrome_options = Options()
-    # chrome_options.add_argument("--headless")  # run in headless mode
+    if headless:
+        chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
@@ -43,12 +87,48 @@ def main():
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    if not load_images:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
     chrome_options.page_load_strategy = 'eager'  # Don't wait for all resources to load
     chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36")
 
-    driver_service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=driver_service, options=chrome_options)
+    remote_url = os.environ.get("SELENIUM_REMOTE_URL")
+    if remote_url:
+        # Run against a Selenium Grid / standalone container instead of a local chromedriver
+        driver = webdriver.Remote(command_executor=remote_url, options=chrome_options)
+    else:
+        driver_service = Service(resolve_chromedriver_path())
+        driver = webdriver.Chrome(service=driver_service, options=chrome_options)
     driver.set_page_load_timeout(60)  # 60 seconds timeout
+    return driver
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Interactively crawl a website.")
+    parser.add_argument("url", nargs="?", help="URL to start crawling from")
+    parser.add_argument("--url", dest="url_option", help="URL to start crawling from (same as the positional argument)")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window")
+    parser.add_argument("--no-images", action="store_true", help="Do not load images")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted crawl from its checkpoint")
+    args = parser.parse_args()
+    args.url = args.url_option or args.url or "https://quickbooks.intuit.com"
+    return args
+
+def main():
+    setup_logging()
+    args = parse_args()
+
+    # Ensure screenshots dir exists
+    os.makedirs("screenshots", exist_ok=True)
+
+    # Clear or create the crawl log (kept when resuming an interrupted crawl)
+    if not args.resume:
+        with open("crawl_log.md", "w", encoding="utf-8") as f:
+            f.write("# Crawl Log\n\n")
+
+    driver = make_crawl_driver(headless=args.headless, load_images=not args.no_images)
 
     # Create decision maker and crawler
     decision_maker = HumanDecisionMaker()
@@ -59,21 +139,11 @@ def main():
 
     # Run interactive crawl
     try:
-        graph = crawler.crawl(start_url)
+        graph = crawler.crawl(args.url, resume=args.resume)
         print(f"\nCrawl completed. Results stored in crawl_log.md and /screenshots.\n")
-        print(f"Graph contains {len(graph.nodes)} pages and {len(graph.edges)} actions.\n")
+        print(f"Graph contains {len(graph.pages)} pages and {len(graph.edges)} actions.\n")
     finally:
         driver.quit()
 
 if __name__ == "__main__":
-    # Ensure screenshots dir exists
-    screenshots_dir = os.path.join("screenshots")
-    if not os.path.exists(screenshots_dir):
-        os.mkdir(screenshots_dir)
-
-    # Clear or create the crawl log
-    log_file = os.path.join("crawl_log.md")
-    with open(log_file, "w", encoding="utf-8") as f:
-        f.write("# Crawl Log\n\n")
-
-    main() 
\ No newline at end of file
+    main()